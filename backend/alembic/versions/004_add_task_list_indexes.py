@@ -0,0 +1,51 @@
+"""Add indexes for task list filtering, sorting and search
+
+Revision ID: 004_add_task_list_indexes
+Revises: 003_add_users_table
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision: str = '004_add_task_list_indexes'
+down_revision: Union[str, None] = '003_add_users_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match PRIORITY_RANK_SQL in app/models/task.py so the planner can use the index
+PRIORITY_RANK_SQL = "CASE priority WHEN 'high' THEN 3 WHEN 'medium' THEN 2 WHEN 'low' THEN 1 ELSE 0 END"
+
+
+def upgrade() -> None:
+    # Filter + default sort combinations
+    op.create_index('ix_tasks_completed_created_at', 'tasks', ['completed', 'created_at'], unique=False)
+    op.create_index('ix_tasks_priority_created_at', 'tasks', ['priority', 'created_at'], unique=False)
+
+    # Sort orders other than created_at
+    op.create_index('ix_tasks_priority_rank_created_at', 'tasks',
+                    [sa.text(f"({PRIORITY_RANK_SQL})"), 'created_at'], unique=False)
+    op.create_index('ix_tasks_title', 'tasks', ['title'], unique=False)
+
+    # Substring search (ILIKE '%...%') can only use trigram indexes, which are PostgreSQL-only
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index('ix_tasks_title_trgm', 'tasks', ['title'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+        op.create_index('ix_tasks_description_trgm', 'tasks', ['description'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_tasks_description_trgm', table_name='tasks')
+        op.drop_index('ix_tasks_title_trgm', table_name='tasks')
+
+    op.drop_index('ix_tasks_title', table_name='tasks')
+    op.drop_index('ix_tasks_priority_rank_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_priority_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_completed_created_at', table_name='tasks')
@@ -0,0 +1,75 @@
+"""Add full-text search index over task title and description
+
+Revision ID: 005_add_task_full_text_search
+Revises: 004_add_task_list_indexes
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers
+revision: str = '005_add_task_full_text_search'
+down_revision: Union[str, None] = '004_add_task_list_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match TASK_SEARCH_VECTOR_SQL in app/models/task.py
+TASK_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        # Generated column is backfilled by PostgreSQL and kept current on every write
+        op.execute(
+            f"ALTER TABLE tasks ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({TASK_SEARCH_VECTOR_SQL}) STORED"
+        )
+        op.execute("CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)")
+
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+            "title, description, content='tasks', content_rowid='rowid')"
+        )
+        op.execute(
+            "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+            "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+            "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+            "VALUES ('delete', old.rowid, old.title, old.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+            "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+            "VALUES ('delete', old.rowid, old.title, old.description); "
+            "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+            "END"
+        )
+        # Index the rows that already exist
+        op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX ix_tasks_search_vector")
+        op.execute("ALTER TABLE tasks DROP COLUMN search_vector")
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER tasks_fts_au")
+        op.execute("DROP TRIGGER tasks_fts_ad")
+        op.execute("DROP TRIGGER tasks_fts_ai")
+        op.execute("DROP TABLE tasks_fts")
@@ -0,0 +1,26 @@
+"""Add index on tasks.updated_at
+
+Revision ID: 006_add_tasks_updated_at_index
+Revises: 005_add_task_full_text_search
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers
+revision: str = '006_add_tasks_updated_at_index'
+down_revision: Union[str, None] = '005_add_task_full_text_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lets max(updated_at) for list ETags be answered from the index
+    op.create_index('ix_tasks_updated_at', 'tasks', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_updated_at', table_name='tasks')
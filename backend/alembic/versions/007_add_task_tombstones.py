@@ -0,0 +1,63 @@
+"""Add task_tombstones table for delta sync
+
+Revision ID: 007_add_task_tombstones
+Revises: 006_add_tasks_updated_at_index
+Create Date: 2026-10-18 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision: str = '007_add_task_tombstones'
+down_revision: Union[str, None] = '006_add_tasks_updated_at_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create the task_tombstones table
+    op.create_table(
+        'task_tombstones',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_task_tombstones_deleted_at'), 'task_tombstones', ['deleted_at'], unique=False)
+
+    # Record a tombstone for every deleted task
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            "CREATE OR REPLACE FUNCTION record_task_tombstone() RETURNS trigger AS $$ "
+            "BEGIN "
+            "INSERT INTO task_tombstones (id, deleted_at) VALUES (OLD.id, now()) "
+            "ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at; "
+            "RETURN OLD; "
+            "END $$ LANGUAGE plpgsql"
+        )
+        op.execute(
+            "CREATE TRIGGER tasks_tombstone AFTER DELETE ON tasks "
+            "FOR EACH ROW EXECUTE FUNCTION record_task_tombstone()"
+        )
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE TRIGGER tasks_tombstone AFTER DELETE ON tasks BEGIN "
+            "INSERT OR REPLACE INTO task_tombstones (id, deleted_at) VALUES (old.id, CURRENT_TIMESTAMP); "
+            "END"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP TRIGGER tasks_tombstone ON tasks")
+        op.execute("DROP FUNCTION record_task_tombstone()")
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER tasks_tombstone")
+
+    op.drop_index(op.f('ix_task_tombstones_deleted_at'), table_name='task_tombstones')
+    op.drop_table('task_tombstones')
@@ -0,0 +1,27 @@
+"""Add expression index on lower(tasks.title)
+
+Revision ID: 008_add_tasks_title_lower_index
+Revises: 007_add_task_tombstones
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision: str = '008_add_tasks_title_lower_index'
+down_revision: Union[str, None] = '007_add_task_tombstones'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lets the chat agent resolve a task by title without scanning the table
+    op.create_index('ix_tasks_title_lower', 'tasks', [sa.text('lower(title)')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_title_lower', table_name='tasks')
@@ -0,0 +1,56 @@
+import secrets
+
+from app.core.settings import settings
+from .revocation import RevocationStore, MemoryRevocationStore, RedisRevocationStore
+from .tokens import TokenSigner, ACCESS_TOKEN, REFRESH_TOKEN
+from .throttle import RateLimiter, MemoryRateLimiter, RedisRateLimiter, LoginThrottle
+
+
+def build_revocation_store() -> RevocationStore:
+    """Create the revocation store selected by TOKEN_REVOCATION_BACKEND"""
+    if settings.token_revocation_backend.lower() == "redis":
+        if not settings.redis_url:
+            raise ValueError("TOKEN_REVOCATION_BACKEND=redis requires REDIS_URL")
+        return RedisRevocationStore(settings.redis_url)
+    return MemoryRevocationStore()
+
+
+def build_token_signer() -> TokenSigner:
+    secret = settings.auth_secret_key
+    if not secret:
+        print("AUTH_SECRET_KEY is not set; using a random key, tokens will not survive a restart")
+        secret = secrets.token_urlsafe(32)
+    return TokenSigner(secret, settings.access_token_ttl, settings.refresh_token_ttl)
+
+
+def build_login_throttle() -> LoginThrottle:
+    """Create the signin/signup limiters selected by RATE_LIMIT_BACKEND"""
+    limits = {
+        "ip": (settings.login_ip_burst, settings.login_ip_per_minute),
+        "email": (settings.login_email_burst, settings.login_email_per_minute),
+    }
+    if settings.rate_limit_backend.lower() == "redis":
+        if not settings.redis_url:
+            raise ValueError("RATE_LIMIT_BACKEND=redis requires REDIS_URL")
+        limiters = {
+            name: RedisRateLimiter(settings.redis_url, burst, per_minute, prefix=f"todo:login:{name}:")
+            for name, (burst, per_minute) in limits.items()
+        }
+    else:
+        limiters = {
+            name: MemoryRateLimiter(burst, per_minute, settings.rate_limit_max_keys)
+            for name, (burst, per_minute) in limits.items()
+        }
+    return LoginThrottle(limiters["ip"], limiters["email"])
+
+
+token_signer = build_token_signer()
+token_revocations = build_revocation_store()
+login_throttle = build_login_throttle()
+
+__all__ = [
+    "RevocationStore", "MemoryRevocationStore", "RedisRevocationStore", "TokenSigner",
+    "ACCESS_TOKEN", "REFRESH_TOKEN", "RateLimiter", "MemoryRateLimiter", "RedisRateLimiter",
+    "LoginThrottle", "build_revocation_store", "build_token_signer", "build_login_throttle",
+    "token_signer", "token_revocations", "login_throttle",
+]
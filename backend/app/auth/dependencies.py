@@ -0,0 +1,60 @@
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.auth import ACCESS_TOKEN, login_throttle, token_revocations, token_signer
+from app.schemas.user import TokenClaims
+from app.utils.exceptions import InvalidTokenException
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def verify_token(token: str, expected_type: str) -> TokenClaims:
+    """Decode a token and make sure it hasn't been revoked"""
+    claims = token_signer.decode(token, expected_type)
+    if await token_revocations.is_revoked(claims.jti):
+        raise InvalidTokenException("revoked")
+    return claims
+
+
+async def revoke_token(claims: TokenClaims) -> None:
+    await token_revocations.revoke(claims.jti, claims.exp)
+
+
+async def get_optional_token_claims(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Optional[TokenClaims]:
+    """Claims of a valid bearer access token, or None when no token was sent"""
+    if credentials is None:
+        return None
+    try:
+        return await verify_token(credentials.credentials, ACCESS_TOKEN)
+    except InvalidTokenException as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def get_current_user(claims: Optional[TokenClaims] = Depends(get_optional_token_claims)) -> TokenClaims:
+    """Require a valid bearer access token; verified from its signature alone, no database query"""
+    if claims is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
+
+
+async def enforce_login_throttle(request: Request, email: str) -> None:
+    """Reject an auth attempt with 429 when its IP or email is over the limit"""
+    retry_after = await login_throttle.check(request.client.host if request.client else None, email)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts. Please try again later.",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,65 @@
+import time
+from typing import Any, Dict
+
+
+class RevocationStore:
+    """Set of revoked token ids (jti), each kept until its token would have expired anyway"""
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        raise NotImplementedError
+
+    async def is_revoked(self, jti: str) -> bool:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class MemoryRevocationStore(RevocationStore):
+    """
+    Per-process revocation set; lookups are a single dict probe.
+
+    Revocations only reach the worker that handled the signout, so use
+    RedisRevocationStore when running several workers.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self._prune_at = 1024
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        self._revoked[jti] = expires_at
+        if len(self._revoked) >= self._prune_at:
+            # Amortised cleanup: expired entries can no longer match a valid token
+            now = time.time()
+            self._revoked = {key: exp for key, exp in self._revoked.items() if exp > now}
+            self._prune_at = max(1024, len(self._revoked) * 2)
+
+    async def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "revoked": len(self._revoked)}
+
+
+class RedisRevocationStore(RevocationStore):
+    """Revocation set shared by every worker; requires the optional `redis` package"""
+
+    def __init__(self, url: str, prefix: str = "todo:revoked:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("TOKEN_REVOCATION_BACKEND=redis requires the 'redis' package") from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms > 0:
+            await self.client.set(self.prefix + jti, b"1", px=ttl_ms)
+
+    async def is_revoked(self, jti: str) -> bool:
+        return bool(await self.client.exists(self.prefix + jti))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
@@ -0,0 +1,123 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class RateLimiter:
+    """Token bucket per key: `burst` attempts at once, refilled at `per_minute`"""
+
+    def __init__(self, burst: int, per_minute: float):
+        self.capacity = float(burst)
+        self.rate = per_minute / 60.0
+        self.allowed = 0
+        self.throttled = 0
+
+    async def acquire(self, key: str) -> float:
+        """Take one token for `key`; returns 0 if allowed, else seconds until one is available"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {"allowed": self.allowed, "throttled": self.throttled}
+
+    def _record(self, wait: float) -> float:
+        if wait:
+            self.throttled += 1
+        else:
+            self.allowed += 1
+        return wait
+
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    In-process token buckets, two floats per key, capped at `max_keys`.
+
+    The least recently seen key is evicted first, so a flood of distinct keys
+    can't grow memory, while keys under active attack stay tracked.
+    """
+
+    def __init__(self, burst: int, per_minute: float, max_keys: int):
+        super().__init__(burst, per_minute)
+        self.max_keys = max_keys
+        self.evictions = 0
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    async def acquire(self, key: str) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+            bucket = self._buckets[key] = [self.capacity, now]
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return self._record(0.0)
+        return self._record((1 - bucket[0]) / self.rate)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "keys": len(self._buckets), "evictions": self.evictions}
+
+
+# Refill, spend and persist a bucket atomically; idle buckets expire once full again
+_REDIS_TOKEN_BUCKET = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """Token buckets shared by every worker; requires the optional `redis` package"""
+
+    def __init__(self, url: str, burst: int, per_minute: float, prefix: str):
+        super().__init__(burst, per_minute)
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def acquire(self, key: str) -> float:
+        wait = await self._script(keys=[self.prefix + key], args=[self.capacity, self.rate, time.time()])
+        return self._record(float(wait))
+
+
+class LoginThrottle:
+    """Per-IP and per-email limits applied to auth attempts before any password hashing"""
+
+    def __init__(self, ip_limiter: RateLimiter, email_limiter: RateLimiter):
+        self.ip_limiter = ip_limiter
+        self.email_limiter = email_limiter
+
+    async def check(self, ip: Optional[str], email: str) -> float:
+        """Seconds the caller must wait, or 0 if the attempt may proceed"""
+        if ip:
+            wait = await self.ip_limiter.acquire(ip)
+            if wait:
+                return math.ceil(wait)
+        wait = await self.email_limiter.acquire(email.strip().lower())
+        return math.ceil(wait) if wait else 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ip": self.ip_limiter.stats(), "email": self.email_limiter.stats()}
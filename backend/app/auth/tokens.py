@@ -0,0 +1,79 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
+
+from app.schemas.user import TokenClaims, TokenPair
+from app.utils.exceptions import InvalidTokenException
+
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+# Tokens are compact HS256 JWTs, so standard JWT tooling can inspect them
+_HEADER = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class TokenSigner:
+    """Issues and verifies signed access/refresh tokens without touching the database"""
+
+    def __init__(self, secret: str, access_ttl: int, refresh_ttl: int):
+        self._key = secret.encode()
+        self.access_ttl = access_ttl
+        self.refresh_ttl = refresh_ttl
+
+    def issue_pair(self, user_id: uuid.UUID, email: str, username: str) -> TokenPair:
+        """Create a fresh access token and refresh token for a user"""
+        now = int(time.time())
+        access_token = self._encode(user_id, email, username, ACCESS_TOKEN, now, self.access_ttl)
+        refresh_token = self._encode(user_id, email, username, REFRESH_TOKEN, now, self.refresh_ttl)
+        return TokenPair(access_token=access_token, refresh_token=refresh_token, expires_in=self.access_ttl)
+
+    def decode(self, token: str, expected_type: str) -> TokenClaims:
+        """
+        Check the signature, expiry and type of a token and return its claims.
+
+        Revocation is checked separately, since it may need the shared store.
+        """
+        try:
+            signing_input, signature = token.encode().rsplit(b".", 1)
+            if not hmac.compare_digest(self._sign(signing_input), _b64decode(signature)):
+                raise InvalidTokenException("bad signature")
+            header, payload = signing_input.split(b".")
+            if header != _HEADER:
+                raise InvalidTokenException("unsupported header")
+            claims = TokenClaims.model_validate_json(_b64decode(payload))
+        except InvalidTokenException:
+            raise
+        except ValueError:
+            raise InvalidTokenException("malformed")
+        if claims.type != expected_type:
+            raise InvalidTokenException(f"not a {expected_type} token")
+        if claims.exp <= time.time():
+            raise InvalidTokenException("expired")
+        return claims
+
+    def _encode(self, user_id, email: str, username: str, token_type: str, now: int, ttl: int) -> str:
+        payload = {
+            "sub": str(user_id),
+            "email": email,
+            "username": username,
+            "type": token_type,
+            "jti": uuid.uuid4().hex,
+            "iat": now,
+            "exp": now + ttl,
+        }
+        signing_input = _HEADER + b"." + _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode()
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        return hmac.new(self._key, signing_input, hashlib.sha256).digest()
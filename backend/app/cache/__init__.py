@@ -0,0 +1,20 @@
+from app.core.settings import settings
+from .backends import CacheBackend, NullCache, LRUCache, RedisCache
+
+
+def build_cache_backend() -> CacheBackend:
+    """Create the cache backend selected by CACHE_BACKEND"""
+    backend = settings.cache_backend.lower()
+    if backend == "none":
+        return NullCache()
+    if backend == "redis":
+        if not settings.redis_url:
+            raise ValueError("CACHE_BACKEND=redis requires REDIS_URL")
+        return RedisCache(settings.redis_url, default_ttl=settings.cache_ttl)
+    return LRUCache(settings.cache_max_bytes, default_ttl=settings.cache_ttl)
+
+
+# Shared by the HTTP routes and the MCP tools so both see the same invalidations
+task_cache = build_cache_backend()
+
+__all__ = ["CacheBackend", "NullCache", "LRUCache", "RedisCache", "build_cache_backend", "task_cache"]
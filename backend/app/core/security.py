@@ -0,0 +1,72 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.settings import settings
+
+# Argon2id with cost parameters from settings. Hashes made with other
+# parameters still verify, and are flagged for a rehash on the next login.
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism,
+)
+
+_executor: Optional[Executor] = None
+
+
+def _get_executor() -> Executor:
+    """
+    Pool that runs hashing off the event loop.
+
+    argon2 releases the GIL, so threads hash in parallel; a process pool is
+    there for deployments that would rather isolate the memory cost. Either
+    way the worker count caps how many hashes run at once, and further
+    callers queue instead of piling more memory-hard work onto the CPU.
+    """
+    global _executor
+    if _executor is None:
+        if settings.password_hash_executor == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.password_hash_workers)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.password_hash_workers, thread_name_prefix="password-hash"
+            )
+    return _executor
+
+
+def shutdown_password_hashing() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+# Module-level so a process pool can pickle them by reference
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, password_hash)
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), _hash, password)
+
+
+async def verify_password(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password against its stored hash without blocking the event loop.
+
+    Returns (verified, new_hash); new_hash is set when the stored hash used
+    outdated parameters and should be replaced.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), _verify_and_update, password, password_hash)
@@ -4,10 +4,79 @@ from typing import Optional
 
 class Settings(BaseSettings):
     database_url: str
+    # Optional read replica; read-only endpoints use it unless the client just wrote
+    database_read_url: Optional[str] = None
+    db_read_after_write_window: float = 5.0
     environment: str = "development"
     log_level: str = "info"
     gemini_api_key: Optional[str] = None
 
+    # Database connection pool
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Connections opened at startup; defaults to db_pool_size, and is capped at it
+    db_pool_warm_size: Optional[int] = None
+    # asyncpg prepared statement cache; set to 0 behind PgBouncer in transaction mode
+    db_statement_cache_size: int = 100
+
+    # Task read cache: "memory" (per-process LRU), "redis" or "none"
+    cache_backend: str = "memory"
+    cache_ttl: float = 10.0
+    cache_max_bytes: int = 32 * 1024 * 1024
+    redis_url: Optional[str] = None
+
+    # Delta sync: how long tombstones are kept, and how far behind "now" a sync
+    # stops so transactions still committing with earlier timestamps aren't skipped
+    tombstone_retention_days: int = 30
+    sync_commit_skew_seconds: float = 2.0
+
+    # Password hashing: argon2id cost, and the pool that runs it off the event loop
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536  # KiB
+    argon2_parallelism: int = 4
+    password_hash_executor: str = "thread"  # "thread" or "process"
+    password_hash_workers: int = 2
+
+    # Signed auth tokens. Without a secret a random one is generated per process,
+    # so tokens stop working on restart and aren't accepted by other workers.
+    auth_secret_key: Optional[str] = None
+    access_token_ttl: int = 15 * 60
+    refresh_token_ttl: int = 14 * 24 * 3600
+    # Revoked token ids: "memory" (per process) or "redis" (uses REDIS_URL)
+    token_revocation_backend: str = "memory"
+
+    # Signin/signup attempts allowed before hashing: a burst, refilled per minute.
+    # "memory" buckets are per process; "redis" shares them (uses REDIS_URL).
+    rate_limit_backend: str = "memory"
+    rate_limit_max_keys: int = 100_000
+    login_ip_burst: int = 20
+    login_ip_per_minute: float = 20
+    login_email_burst: int = 5
+    login_email_per_minute: float = 5
+
+    # Chat agent: cache of Gemini replies per prompt and task context
+    chat_cache_ttl: float = 300.0
+    chat_cache_max_bytes: int = 4 * 1024 * 1024
+    # Model backend for the chat agent: "gemini", or "stub" for load tests
+    # (replies instantly with CHAT_STUB_REPLY after CHAT_STUB_DELAY seconds)
+    chat_model_backend: str = "gemini"
+    chat_stub_reply: str = "ACTION:general|RESPONSE:Hello!"
+    chat_stub_delay: float = 0.0
+    # Limits on model calls: concurrent calls, seconds to wait for a slot, deadline
+    # per attempt (per chunk when streaming), retries with jittered backoff, and the
+    # circuit breaker that fails fast after consecutive failures
+    chat_max_concurrency: int = 8
+    chat_queue_timeout: float = 2.0
+    chat_call_timeout: float = 20.0
+    chat_max_retries: int = 2
+    chat_retry_base_delay: float = 0.5
+    chat_breaker_failure_threshold: int = 5
+    chat_breaker_reset_seconds: float = 30.0
+
     class Config:
         env_file = ".env"
 
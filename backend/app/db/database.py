@@ -1,6 +1,10 @@
+from fastapi import Request
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.settings import settings
+from app.db.pool import InstrumentedQueuePool
+from app.db.routing import reads_pinned_to_primary, mark_primary_write
 import os
 
 # =========================
@@ -9,8 +13,37 @@ import os
 # Use database URL from settings
 DATABASE_URL = settings.database_url
 
+
+def engine_options(database_url: str) -> dict:
+    """Engine keyword arguments derived from the pool settings"""
+    url = make_url(database_url)
+    options = {"echo": settings.db_echo, "pool_pre_ping": settings.db_pool_pre_ping}
+
+    # In-memory SQLite uses a single static connection; there is no pool to size
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"statement_cache_size": settings.db_statement_cache_size}
+    return options
+
+
 # Configuration for database engine
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+
+# Read replica engine; falls back to the primary when no replica is configured
+DATABASE_READ_URL = settings.database_read_url
+read_engine = (
+    create_async_engine(DATABASE_READ_URL, **engine_options(DATABASE_READ_URL))
+    if DATABASE_READ_URL else engine
+)
 # =========================
 # ASYNC SESSION
 # =========================
@@ -20,6 +53,16 @@ AsyncSessionLocal = sessionmaker(
     class_=AsyncSession,
     autocommit=False,
     autoflush=False,
+    # Rows returned by a write are serialized after the commit; keep them loaded
+    expire_on_commit=False,
+)
+
+AsyncReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
 )
 
 # =========================
@@ -32,6 +75,29 @@ Base = declarative_base()
 # DEPENDENCY
 # =========================
 
-async def get_async_session() -> AsyncSession:
+async def get_async_session(request: Request) -> AsyncSession:
+    mark_primary_write(request)
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_primary_read_session() -> AsyncSession:
+    """Session on the primary for reads that must not lag behind writes; doesn't pin the client"""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+def reads_from_replica(request: Request) -> bool:
+    """True if this request's reads go to a separate replica rather than the primary"""
+    return read_engine is not engine and not reads_pinned_to_primary(request)
+
+
+def read_session_factory(request: Request):
+    """The replica's session factory, unless this client wrote recently"""
+    return AsyncSessionLocal if reads_pinned_to_primary(request) else AsyncReadSessionLocal
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    """Session for read-only endpoints: the replica, unless this client wrote recently"""
+    async with read_session_factory(request)() as session:
+        yield session
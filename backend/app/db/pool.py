@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolWaitStats:
+    """Running totals of how long callers waited to check out a connection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait time, including time spent connecting"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except Exception:
+            self.wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return record
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open `connections` pooled connections up front so early requests skip connect/TLS latency"""
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        # Overflow connections are closed as soon as they're returned, and
+        # openers past pool_size + max_overflow would wait out pool_timeout
+        # and fail startup, so never warm more than the pool keeps.
+        connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return
+
+    opened = 0
+    all_open = asyncio.Event()
+
+    async def _open_and_hold():
+        nonlocal opened
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                opened += 1
+                if opened == connections:
+                    all_open.set()
+                # Hold every connection until all are open, otherwise the pool
+                # would hand the same one back to each caller.
+                await all_open.wait()
+        finally:
+            # Never leave the others waiting if this connection failed
+            all_open.set()
+
+    await asyncio.gather(*(_open_and_hold() for _ in range(connections)))
+
+
+def pool_status(engine: AsyncEngine) -> Dict[str, Any]:
+    """Current pool occupancy plus checkout wait statistics"""
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        **pool.wait_stats.snapshot(),
+    }
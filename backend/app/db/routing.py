@@ -0,0 +1,57 @@
+import time
+
+from fastapi import Request
+
+from app.core.settings import settings
+
+# Cookie holding the unix time until which this client's reads go to the primary
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+
+
+def mark_primary_write(request: Request) -> None:
+    """Record that this request used the primary for writing"""
+    request.state.db_primary_write = True
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    """True if the client wrote recently enough that the replica may not have caught up"""
+    value = request.cookies.get(PRIMARY_STICKY_COOKIE)
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marks clients that just wrote so their reads stick to the primary.
+
+    After a successful request that opened a write session the response sets a
+    short-lived cookie; get_read_session routes requests carrying it to the primary.
+    """
+
+    def __init__(self, app, window: float = None):
+        self.app = app
+        self.window = settings.db_read_after_write_window if window is None else window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            wrote = scope.get("state", {}).get("db_primary_write", False)
+            if message["type"] == "http.response.start" and wrote and message["status"] < 400:
+                until = time.time() + self.window
+                cookie = (
+                    f"{PRIMARY_STICKY_COOKIE}={until:.3f}; Max-Age={int(self.window) + 1}; "
+                    f"Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode("latin-1"))
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
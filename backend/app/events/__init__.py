@@ -0,0 +1,6 @@
+from .broker import TaskEventBroker
+
+# Process-wide broker; the task repository publishes to it after each commit
+task_events = TaskEventBroker()
+
+__all__ = ["TaskEventBroker", "task_events"]
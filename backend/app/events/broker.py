@@ -0,0 +1,90 @@
+import asyncio
+import json
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+HEARTBEAT_SECONDS = 15.0
+
+
+class TaskEventBroker:
+    """
+    In-process fan-out of task change events to Server-Sent Events subscribers.
+
+    Each published event is encoded once and kept in a bounded replay buffer.
+    Subscribers park on a single shared future that is resolved on every
+    publish, so idle connections cost no polling or per-client timers beyond
+    the heartbeat. Event ids are "<epoch>-<seq>"; the epoch changes whenever
+    the process restarts so clients resuming from an unknown id are told to
+    refetch instead of silently missing events.
+    """
+
+    def __init__(self, buffer_size: int = 1000):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._buffer: Deque[Tuple[int, bytes]] = deque(maxlen=buffer_size)
+        self._wakeup: Optional[asyncio.Future] = None
+        self.subscribers = 0
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Record an event and wake every waiting subscriber"""
+        self._seq += 1
+        event_id = f"{self.epoch}-{self._seq}"
+        payload = json.dumps({"type": event_type, **data}, default=str)
+        frame = f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n".encode()
+        self._buffer.append((self._seq, frame))
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+        self._wakeup = None
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Yield SSE frames, first replaying anything after `last_event_id`"""
+        self.subscribers += 1
+        try:
+            position = self._resume_position(last_event_id)
+            if position is None:
+                # Unknown epoch or the gap fell out of the buffer: the client must refetch
+                yield self._reset_frame()
+                position = self._seq
+
+            while True:
+                while position < self._seq:
+                    if self._buffer and self._buffer[0][0] > position + 1:
+                        # This subscriber fell further behind than the buffer holds
+                        yield self._reset_frame()
+                        position = self._seq
+                        break
+                    for seq, frame in list(self._buffer):
+                        if seq > position:
+                            yield frame
+                            position = seq
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._next_wakeup()), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # SSE comment line; keeps proxies from closing idle connections
+                    yield b": keep-alive\n\n"
+        finally:
+            self.subscribers -= 1
+
+    def _reset_frame(self) -> bytes:
+        return f"id: {self.epoch}-{self._seq}\nevent: reset\ndata: {{}}\n\n".encode()
+
+    def _next_wakeup(self) -> asyncio.Future:
+        if self._wakeup is None or self._wakeup.done():
+            self._wakeup = asyncio.get_running_loop().create_future()
+        return self._wakeup
+
+    def _resume_position(self, last_event_id: Optional[str]) -> Optional[int]:
+        if not last_event_id:
+            return self._seq
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._buffer[0][0] if self._buffer else self._seq + 1
+        if seq > self._seq or seq < oldest - 1:
+            return None
+        return seq
+
+    def stats(self) -> Dict[str, Any]:
+        return {"subscribers": self.subscribers, "last_event_id": f"{self.epoch}-{self._seq}"}
@@ -1,5 +1,6 @@
 import sys
 import os
+import asyncio
 # Add the project root to the Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
@@ -10,11 +11,25 @@ from app.routers import tasks
 from app.routers.auth import router as auth_router
 from app.routers.chat import router as chat_router
 import uvicorn
-from app.db.database import engine
+from app.db.database import engine, read_engine, AsyncSessionLocal
+from app.db.routing import ReadYourWritesMiddleware
 from app.db.base import Base
+from app.db.pool import warm_pool, pool_status
+from app.core.settings import settings
+from app.core.security import shutdown_password_hashing
+from app.cache import task_cache
+from app.events import task_events
+from app.auth import login_throttle
+from mcp.intents import intent_stats
+from mcp.response_cache import chat_response_cache
+from mcp.resilience import model_guard
+from app.repositories.task_repository import TaskRepository
+from app.services.task_service import TaskService
 
 # Import all models to ensure they are registered with SQLAlchemy
-from app.models import Task, User  # noqa: F401
+from app.models import Task, TaskTombstone, User  # noqa: F401
+
+TOMBSTONE_PURGE_INTERVAL_SECONDS = 3600
 
 
 app = FastAPI(
@@ -32,6 +47,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Keep a client's reads on the primary briefly after it writes
+if read_engine is not engine:
+    app.add_middleware(ReadYourWritesMiddleware)
+
 # Include the tasks router
 app.include_router(tasks.router, prefix="/api/v1", tags=["tasks"])
 
@@ -48,6 +67,33 @@ async def startup_event():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    # Pre-open the pool so the first requests after a rollout don't pay connect latency
+    warm_size = settings.db_pool_size if settings.db_pool_warm_size is None else settings.db_pool_warm_size
+    await warm_pool(engine, warm_size)
+    if read_engine is not engine:
+        await warm_pool(read_engine, warm_size)
+
+    app.state.tombstone_purge = asyncio.create_task(purge_tombstones_periodically())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.tombstone_purge.cancel()
+    shutdown_password_hashing()
+
+
+async def purge_tombstones_periodically():
+    """Drop delete tombstones once they fall outside the sync retention window"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                purged = await TaskService(TaskRepository(session)).purge_tombstones()
+            if purged:
+                print(f"Purged {purged} task tombstones")
+        except Exception as e:
+            print(f"Tombstone purge failed: {str(e)}")
+        await asyncio.sleep(TOMBSTONE_PURGE_INTERVAL_SECONDS)
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Todo API"}
@@ -56,6 +102,33 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db-pool")
+def db_pool_health():
+    status = pool_status(engine)
+    if read_engine is not engine:
+        status["read_replica"] = pool_status(read_engine)
+    return status
+
+@app.get("/health/cache")
+def cache_health():
+    return task_cache.stats()
+
+@app.get("/health/events")
+def events_health():
+    return task_events.stats()
+
+@app.get("/health/rate-limits")
+def rate_limit_health():
+    return login_throttle.stats()
+
+@app.get("/health/chat")
+def chat_health():
+    return {
+        **intent_stats.snapshot(),
+        "response_cache": chat_response_cache.stats(),
+        "model": model_guard.stats(),
+    }
+
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from .task import Task
+from .task_tombstone import TaskTombstone
 from .user import User
 
-__all__ = ["Task", "User"]
\ No newline at end of file
+__all__ = ["Task", "TaskTombstone", "User"]
@@ -1,15 +1,71 @@
-from sqlalchemy import Column, String, Boolean, Text
+from sqlalchemy import Column, String, Boolean, Text, Index, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import BaseModel
 import uuid
 
+# Ordinal used for priority sorting; the same SQL expression backs the
+# ix_tasks_priority_rank_created_at index so sorts can walk it in order.
+PRIORITY_RANKS = {"high": 3, "medium": 2, "low": 1}
+PRIORITY_RANK_SQL = (
+    "CASE priority WHEN 'high' THEN 3 WHEN 'medium' THEN 2 WHEN 'low' THEN 1 ELSE 0 END"
+)
+
 
 class Task(BaseModel):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_completed", "completed"),
+        Index("ix_tasks_created_at", "created_at"),
+        Index("ix_tasks_completed_created_at", "completed", "created_at"),
+        Index("ix_tasks_priority_created_at", "priority", "created_at"),
+        Index("ix_tasks_priority_rank_created_at", text(f"({PRIORITY_RANK_SQL})"), "created_at"),
+        Index("ix_tasks_title", "title"),
+        # Case-insensitive exact title lookups (the chat agent resolves tasks by name)
+        Index("ix_tasks_title_lower", text("lower(title)")),
+        Index("ix_tasks_updated_at", "updated_at"),
+    )
 
     # Using PostgreSQL UUID type
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     completed = Column(Boolean, nullable=False, default=False)
-    priority = Column(String(20), nullable=False, default='medium')
\ No newline at end of file
+    priority = Column(String(20), nullable=False, default='medium')
+
+
+# Full-text search index. PostgreSQL keeps a generated tsvector column with a
+# GIN index; SQLite keeps an external-content FTS5 table updated by triggers.
+# Neither is mapped on Task so ordinary queries never load it.
+TASK_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+POSTGRESQL_SEARCH_DDL = [
+    f"ALTER TABLE tasks ADD COLUMN search_vector tsvector "
+    f"GENERATED ALWAYS AS ({TASK_SEARCH_VECTOR_SQL}) STORED",
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)",
+]
+
+# tasks_fts rows share the rowid of their task; run
+# INSERT INTO tasks_fts(tasks_fts) VALUES('rebuild') after a VACUUM.
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5(title, description, content='tasks', content_rowid='rowid')",
+    "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+    "END",
+]
+
+for statement in POSTGRESQL_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, DateTime, DDL, event, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.database import Base
+from app.models.task import Task
+
+
+class TaskTombstone(Base):
+    """Marker left behind by a deleted task so delta-sync clients learn about the deletion"""
+    __tablename__ = "task_tombstones"
+
+    # Id of the deleted task
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+
+# Tombstones are written by a trigger so every delete path (single, batch,
+# filter-based, or ad-hoc SQL) records them in the same statement.
+POSTGRESQL_TOMBSTONE_DDL = [
+    "CREATE OR REPLACE FUNCTION record_task_tombstone() RETURNS trigger AS $$ "
+    "BEGIN "
+    "INSERT INTO task_tombstones (id, deleted_at) VALUES (OLD.id, now()) "
+    "ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at; "
+    "RETURN OLD; "
+    "END $$ LANGUAGE plpgsql",
+    "CREATE TRIGGER tasks_tombstone AFTER DELETE ON tasks "
+    "FOR EACH ROW EXECUTE FUNCTION record_task_tombstone()",
+]
+
+SQLITE_TOMBSTONE_DDL = [
+    "CREATE TRIGGER tasks_tombstone AFTER DELETE ON tasks BEGIN "
+    "INSERT OR REPLACE INTO task_tombstones (id, deleted_at) VALUES (old.id, CURRENT_TIMESTAMP); "
+    "END",
+]
+
+# The trigger lives on tasks but writes to task_tombstones, so create that first
+Task.__table__.add_is_dependent_on(TaskTombstone.__table__)
+for statement in POSTGRESQL_TOMBSTONE_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_TOMBSTONE_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
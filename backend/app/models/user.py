@@ -1,12 +1,9 @@
 from sqlalchemy import Column, String, Boolean
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import BaseModel
-from passlib.context import CryptContext
+from app.core.security import pwd_context
 import uuid
 
-# Using argon2 as it's more reliable than bcrypt in some environments
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
 
 class User(BaseModel):
     __tablename__ = "users"
@@ -18,6 +15,9 @@ class User(BaseModel):
     password_hash = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
 
+    # Synchronous helpers for scripts; request handlers use the async
+    # functions in app.core.security so hashing stays off the event loop.
+
     def set_password(self, password: str):
         """Hash and set the user's password"""
         self.password_hash = pwd_context.hash(password)
@@ -0,0 +1,198 @@
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import CacheBackend, task_cache
+from app.models.task import Task
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate, TaskUpdate, TaskBulkUpdate, TaskQuery, TaskResponse
+
+# Bumping a generation counter orphans every key built from the old value
+TASKS_GENERATION = "tasks:generation"
+LISTS_GENERATION = "tasks:lists:generation"
+
+
+class CachedTaskRepository(TaskRepository):
+    """
+    Read-through cache in front of TaskRepository.
+
+    Single tasks are cached under a per-task version token that every write to
+    that task drops, so a reader that loaded the old row before the write and
+    stores it afterwards writes to a key nobody reads again. Tokens are ordinary
+    entries, bounded by the cache's byte budget and TTL like everything else.
+    List, page and search results are keyed by a list generation that every
+    write bumps. Cache hits return TaskResponse objects rather than ORM rows;
+    both carry the same attributes, so TaskService treats them alike.
+
+    With autocommit off, entries are dropped as each write runs, so later reads
+    in the same transaction see it, and dropped again after commit() in case a
+    concurrent reader cached the old rows in between.
+    """
+
+    def __init__(self, db_session: AsyncSession, cache: CacheBackend = task_cache, autocommit: bool = True):
+        super().__init__(db_session, autocommit=autocommit)
+        self.cache = cache
+        self._pending_invalidations: List[Tuple[Any, Tuple[UUID, ...]]] = []
+
+    async def commit(self) -> None:
+        await super().commit()
+        pending, self._pending_invalidations = self._pending_invalidations, []
+        for invalidate, args in pending:
+            await invalidate(*args)
+
+    async def rollback(self) -> None:
+        await super().rollback()
+        self._pending_invalidations = []
+
+    # Reads
+
+    async def get_task_by_id(self, task_id: UUID) -> Optional[Task]:
+        key = await self._task_key(task_id)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return TaskResponse.model_validate_json(cached)
+        db_task = await super().get_task_by_id(task_id)
+        if db_task is not None:
+            await self.cache.set(key, self._dump_task(db_task))
+        return db_task
+
+    async def get_all_tasks(self, query: Optional[TaskQuery] = None) -> List[Task]:
+        query = query or TaskQuery()
+        key = await self._list_key("all", query.model_dump(mode="json"))
+        return await self._cached_list(key, super().get_all_tasks, query)
+
+    async def get_task_list_json(self, query: TaskQuery) -> Tuple[str, Callable[[], Awaitable[bytes]]]:
+        # The version and body share one entry, so a hit never pairs a body with
+        # a version it wasn't read at
+        key = await self._list_key("list", query.model_dump(mode="json"))
+        cached = await self.cache.get(key)
+        if cached is not None:
+            version, body = cached.split(b"\n", 1)
+
+            async def load_cached() -> bytes:
+                return body
+            return version.decode(), load_cached
+
+        version, load = await super().get_task_list_json(query)
+
+        async def load_and_store() -> bytes:
+            body = await load()
+            await self.cache.set(key, version.encode() + b"\n" + body)
+            return body
+        return version, load_and_store
+
+    async def get_tasks_page(
+        self, query: TaskQuery, limit: int, after: Optional[Tuple[Any, UUID]] = None
+    ) -> List[Task]:
+        key = await self._list_key("page", query.model_dump(mode="json"), limit, after)
+        return await self._cached_list(key, super().get_tasks_page, query, limit, after)
+
+    async def search_tasks(self, search: str, limit: int, offset: int = 0) -> List[Task]:
+        key = await self._list_key("search", search, limit, offset)
+        return await self._cached_list(key, super().search_tasks, search, limit, offset)
+
+    # Writes
+
+    async def create_task(self, task_create: TaskCreate) -> Task:
+        db_task = await super().create_task(task_create)
+        await self._after_write(self._invalidate_lists)
+        return db_task
+
+    async def update_task(self, task_id: UUID, task_update: TaskUpdate) -> Optional[Task]:
+        db_task = await super().update_task(task_id, task_update)
+        await self._after_write(self._invalidate_tasks, task_id)
+        return db_task
+
+    async def toggle_task(self, task_id: UUID) -> Optional[Task]:
+        db_task = await super().toggle_task(task_id)
+        await self._after_write(self._invalidate_tasks, task_id)
+        return db_task
+
+    async def delete_task(self, task_id: UUID) -> bool:
+        deleted = await super().delete_task(task_id)
+        await self._after_write(self._invalidate_tasks, task_id)
+        return deleted
+
+    async def apply_batch(self, creates, updates, toggle_ids, delete_ids):
+        outcome = await super().apply_batch(creates, updates, toggle_ids, delete_ids)
+        touched = {task_id for task_id, _ in updates} | set(toggle_ids) | set(delete_ids)
+        await self._after_write(self._invalidate_tasks, *touched)
+        return outcome
+
+    async def insert_task_rows(self, rows: List[Dict[str, Any]]) -> int:
+        inserted = await super().insert_task_rows(rows)
+        await self._after_write(self._invalidate_lists)
+        return inserted
+
+    async def update_tasks_where(self, query: TaskQuery, values: TaskBulkUpdate) -> int:
+        affected = await super().update_tasks_where(query, values)
+        await self._after_write(self._invalidate_all)
+        return affected
+
+    async def delete_tasks_where(self, query: TaskQuery) -> int:
+        affected = await super().delete_tasks_where(query)
+        await self._after_write(self._invalidate_all)
+        return affected
+
+    # Helpers
+
+    async def _cached_list(self, key: str, load, *args) -> List[Task]:
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return [TaskResponse.model_validate(item) for item in json.loads(cached)]
+        db_tasks = await load(*args)
+        payload = [TaskResponse.model_validate(task).model_dump(mode="json") for task in db_tasks]
+        await self.cache.set(key, json.dumps(payload).encode())
+        return db_tasks
+
+    async def _task_key(self, task_id: UUID) -> str:
+        generation = await self.cache.get_counter(TASKS_GENERATION)
+        version = await self._task_version(task_id)
+        return f"task:{generation}:{task_id}:{version}"
+
+    async def _task_version(self, task_id: UUID) -> str:
+        """
+        The task's current version token. A missing token (never set, dropped
+        by a write, evicted or expired) is replaced by a random one, which
+        orphans anything cached under the old token.
+        """
+        key = self._task_version_key(task_id)
+        version = await self.cache.get(key)
+        if version is None:
+            version = uuid4().hex.encode()
+            # Stored before the row is read, so a write that drops it in
+            # between also orphans the entry this reader is about to store
+            await self.cache.set(key, version)
+        return version.decode()
+
+    @staticmethod
+    def _task_version_key(task_id: UUID) -> str:
+        return f"task:version:{task_id}"
+
+    async def _list_key(self, kind: str, *params: Any) -> str:
+        generation = await self.cache.get_counter(LISTS_GENERATION)
+        digest = hashlib.blake2b(repr(params).encode(), digest_size=16).hexdigest()
+        return f"tasks:{kind}:{generation}:{digest}"
+
+    async def _after_write(self, invalidate, *args: UUID) -> None:
+        await invalidate(*args)
+        if not self.autocommit:
+            self._pending_invalidations.append((invalidate, args))
+
+    async def _invalidate_tasks(self, *task_ids: UUID) -> None:
+        await self.cache.delete(*(self._task_version_key(task_id) for task_id in task_ids))
+        await self._invalidate_lists()
+
+    async def _invalidate_lists(self) -> None:
+        await self.cache.incr(LISTS_GENERATION)
+
+    async def _invalidate_all(self) -> None:
+        await self.cache.incr(TASKS_GENERATION)
+        await self.cache.incr(LISTS_GENERATION)
+
+    @staticmethod
+    def _dump_task(db_task: Task) -> bytes:
+        return TaskResponse.model_validate(db_task).model_dump_json().encode()
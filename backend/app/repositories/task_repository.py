@@ -1,22 +1,51 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, delete
-from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
-from typing import List, Optional
-from uuid import UUID
+from sqlalchemy import (
+    insert, update, delete, and_, or_, not_, bindparam, literal, literal_column, func, table, column, union_all
+)
+from sqlalchemy.dialects import sqlite
+from app.models.task import Task, PRIORITY_RANKS, PRIORITY_RANK_SQL
+from app.models.task_tombstone import TaskTombstone
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskBulkUpdate, TaskQuery, TaskSortField, SortOrder, TaskResponse
+)
+from app.events import TaskEventBroker, task_events
+from app.utils.serialization import dump_json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime
+from uuid import UUID, uuid4
 
 
 class TaskRepository:
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, events: TaskEventBroker = task_events, autocommit: bool = True):
+        """
+        With autocommit off, writes are left uncommitted and their events held
+        back until commit(), so several writes share one transaction.
+        """
         self.db_session = db_session
+        self.events = events
+        self.autocommit = autocommit
+        self._pending_events: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def commit(self) -> None:
+        """Commit the session's transaction and publish the events of the writes in it"""
+        await self.db_session.commit()
+        pending, self._pending_events = self._pending_events, []
+        for event_type, data in pending:
+            self.events.publish(event_type, data)
+
+    async def rollback(self) -> None:
+        """Roll back the session's transaction and drop the events of the writes in it"""
+        await self.db_session.rollback()
+        self._pending_events = []
 
     async def create_task(self, task_create: TaskCreate) -> Task:
         """Create a new task"""
-        db_task = Task(**task_create.model_dump())
-        self.db_session.add(db_task)
-        await self.db_session.commit()
-        await self.db_session.refresh(db_task)
+        stmt = insert(Task).values(id=uuid4(), **task_create.model_dump()).returning(Task)
+        result = await self.db_session.execute(stmt)
+        db_task = result.scalar_one()
+        await self._commit()
+        self._publish_task("created", db_task)
         return db_task
 
     async def get_task_by_id(self, task_id: UUID) -> Optional[Task]:
@@ -25,37 +54,462 @@ class TaskRepository:
         result = await self.db_session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_all_tasks(self) -> List[Task]:
-        """Get all tasks"""
-        stmt = select(Task).order_by(Task.created_at.desc())
+    async def find_tasks_by_title(self, title: str, limit: int = 10) -> List[Task]:
+        """Tasks whose title equals `title` ignoring case, newest first, via ix_tasks_title_lower"""
+        stmt = (
+            select(Task)
+            # Folded by the database on both sides: SQLite's lower() only folds ASCII,
+            # so Python's str.lower() would miss titles like "Éclair"
+            .where(func.lower(Task.title) == func.lower(literal(title)))
+            .order_by(Task.created_at.desc(), Task.id.desc())
+            .limit(limit)
+        )
+        result = await self.db_session.execute(stmt)
+        return result.scalars().all()
+
+    async def find_tasks_by_titles(self, titles: List[str]) -> Dict[str, Task]:
+        """
+        The newest task for each title, ignoring case, keyed by the title as given, in one query.
+
+        Titles are matched the way find_tasks_by_title matches them, with the
+        database folding both sides, so each match is reported against the
+        requested title it was found for.
+        """
+        if not titles:
+            return {}
+        requested = union_all(
+            *(select(literal(title).label("title")) for title in dict.fromkeys(titles))
+        ).subquery()
+        stmt = (
+            select(requested.c.title, Task)
+            .join(Task, func.lower(Task.title) == func.lower(requested.c.title))
+            .order_by(Task.created_at.desc(), Task.id.desc())
+        )
+        result = await self.db_session.execute(stmt)
+        found: Dict[str, Task] = {}
+        for title, db_task in result.tuples():
+            found.setdefault(title, db_task)
+        return found
+
+    async def get_all_tasks(self, query: Optional[TaskQuery] = None) -> List[Task]:
+        """Get all tasks matching the query, in the requested order"""
+        stmt = self._build_list_statement(query or TaskQuery())
+        result = await self.db_session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_all_task_rows(self, query: Optional[TaskQuery] = None) -> List[Dict[str, Any]]:
+        """
+        Same result as get_all_tasks, as plain dicts keyed like TaskResponse.
+
+        Selecting bare columns skips ORM identity-map bookkeeping, which dominates
+        the cost of large list reads.
+        """
+        columns = [Task.__table__.c[name] for name in TaskResponse.model_fields]
+        stmt = self._build_list_statement(query or TaskQuery()).with_only_columns(*columns)
+        result = await self.db_session.execute(stmt)
+        keys = list(TaskResponse.model_fields)
+        return [dict(zip(keys, row)) for row in result.tuples()]
+
+    async def stream_task_rows(
+        self, query: TaskQuery, batch_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield the tasks matching the query as batches of plain dicts.
+
+        Rows are fetched through a server-side cursor `batch_size` at a time, so
+        memory stays flat however many tasks match.
+        """
+        keys = list(TaskResponse.model_fields)
+        columns = [Task.__table__.c[name] for name in keys]
+        stmt = (
+            self._build_list_statement(query)
+            .with_only_columns(*columns)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db_session.stream(stmt)
+        try:
+            async for partition in result.partitions():
+                yield [dict(zip(keys, row)) for row in partition]
+        finally:
+            await result.close()
+
+    async def get_tasks_page(
+        self, query: TaskQuery, limit: int, after: Optional[Tuple[Any, UUID]] = None
+    ) -> List[Task]:
+        """Get up to `limit` tasks matching the query, starting after the given (sort value, id) position"""
+        stmt = self._build_list_statement(query).limit(limit)
+        if after is not None:
+            stmt = stmt.where(self._seek_condition(query, *after))
+        result = await self.db_session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_tasks_version(self, query: TaskQuery) -> Tuple[int, Optional[datetime]]:
+        """Row count and latest updated_at of the tasks matching the query's filters"""
+        stmt = self._apply_filters(select(func.count(), func.max(Task.updated_at)).select_from(Task), query)
+        result = await self.db_session.execute(stmt)
+        count, last_updated = result.one()
+        return count, last_updated
+
+    async def get_task_list_json(self, query: TaskQuery) -> Tuple[str, Callable[[], Awaitable[bytes]]]:
+        """
+        A version token for the tasks matching the query's filters, and a loader
+        for them as a JSON array.
+
+        The token (row count and latest updated_at) is read first, so a body
+        loaded afterwards is never older than the version it is served with.
+        """
+        count, last_updated = await self.get_tasks_version(query)
+        version = f"{count}:{last_updated.isoformat() if last_updated else ''}"
+
+        async def load() -> bytes:
+            return dump_json(await self.get_all_task_rows(query))
+        return version, load
+
+    async def get_task_version(self, task_id: UUID) -> Optional[datetime]:
+        """updated_at of a single task, or None if it doesn't exist"""
+        stmt = select(Task.updated_at).where(Task.id == task_id)
+        result = await self.db_session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_database_time(self) -> datetime:
+        """The database's clock, which stamps created_at, updated_at and deleted_at"""
+        result = await self.db_session.execute(select(func.now()))
+        return result.scalar_one()
+
+    async def get_changes(
+        self,
+        updated_after: Optional[Tuple[datetime, Optional[UUID]]],
+        deleted_after: Optional[Tuple[datetime, Optional[UUID]]],
+        until: datetime,
+        limit: int,
+    ) -> Tuple[List[Task], List[TaskTombstone]]:
+        """
+        Tasks written and tombstones recorded after the given positions, up to `until`.
+
+        Both streams are walked in (timestamp, id) order on their indexes. A
+        position with no id means everything at or before that timestamp was seen.
+        """
+        until_bound = self._timestamp_bound(until)
+
+        stmt = select(Task).where(Task.updated_at <= until_bound)
+        if updated_after is not None:
+            stmt = stmt.where(self._after_position(Task.updated_at, Task.id, *updated_after))
+        stmt = stmt.order_by(Task.updated_at, Task.id).limit(limit)
+        updated = (await self.db_session.execute(stmt)).scalars().all()
+
+        # A first sync has no deletions to report
+        deleted: List[TaskTombstone] = []
+        if deleted_after is not None:
+            stmt = (
+                select(TaskTombstone)
+                .where(TaskTombstone.deleted_at <= until_bound)
+                .where(self._after_position(TaskTombstone.deleted_at, TaskTombstone.id, *deleted_after))
+                .order_by(TaskTombstone.deleted_at, TaskTombstone.id)
+                .limit(limit)
+            )
+            deleted = (await self.db_session.execute(stmt)).scalars().all()
+        return updated, deleted
+
+    def _after_position(self, timestamp_column, id_column, timestamp: datetime, row_id: Optional[UUID]):
+        bound = self._timestamp_bound(timestamp)
+        if row_id is None:
+            return timestamp_column > bound
+        return and_(
+            timestamp_column >= bound,
+            or_(timestamp_column > bound, and_(timestamp_column == bound, id_column > row_id)),
+        )
+
+    async def purge_tombstones(self, older_than: datetime) -> int:
+        """Delete tombstones recorded before `older_than`"""
+        stmt = delete(TaskTombstone).where(TaskTombstone.deleted_at < self._timestamp_bound(older_than))
         result = await self.db_session.execute(stmt)
+        await self._commit()
+        return result.rowcount
+
+    async def search_tasks(self, search: str, limit: int, offset: int = 0) -> List[Task]:
+        """Full-text search over title and description, most relevant first"""
+        if self.db_session.bind.dialect.name == "sqlite":
+            match = self._fts5_match_expression(search)
+            if not match:
+                return []
+            tasks_fts = table("tasks_fts", column("rowid"))
+            fts_ref = literal_column("tasks_fts")
+            stmt = (
+                select(Task)
+                .join(tasks_fts, tasks_fts.c.rowid == literal_column("tasks.rowid"))
+                .where(fts_ref.op("MATCH")(match))
+                # bm25() is lower for better matches
+                .order_by(func.bm25(fts_ref), Task.id)
+            )
+        else:
+            search_vector = literal_column("tasks.search_vector")
+            ts_query = func.websearch_to_tsquery("english", search)
+            stmt = (
+                select(Task)
+                .where(search_vector.op("@@")(ts_query))
+                .order_by(func.ts_rank(search_vector, ts_query).desc(), Task.id)
+            )
+        result = await self.db_session.execute(stmt.limit(limit).offset(offset))
         return result.scalars().all()
 
+    @staticmethod
+    def _fts5_match_expression(search: str) -> str:
+        """Quote each word so user input can't be parsed as FTS5 query syntax"""
+        return " ".join('"{}"'.format(word.replace('"', '""')) for word in search.split())
+
+    @staticmethod
+    def sort_value(task: Task, sort_by: TaskSortField) -> Any:
+        """Return the value a task is ordered by for the given sort field"""
+        if sort_by == TaskSortField.priority:
+            return PRIORITY_RANKS.get(task.priority, 0)
+        return getattr(task, sort_by.value)
+
+    def _build_list_statement(self, query: TaskQuery):
+        """Translate filters and sort options into a statement served by the task indexes"""
+        stmt = self._apply_filters(select(Task), query)
+        sort_key = self._sort_key(query.sort_by)
+        if query.order == SortOrder.desc:
+            return stmt.order_by(sort_key.desc(), Task.id.desc())
+        return stmt.order_by(sort_key.asc(), Task.id.asc())
+
+    def _apply_filters(self, stmt, query: TaskQuery):
+        """Add the WHERE criteria for the query's filters to a select, update or delete"""
+        if query.completed is not None:
+            stmt = stmt.where(Task.completed == query.completed)
+        if query.priority is not None:
+            stmt = stmt.where(Task.priority == query.priority)
+        if query.search:
+            pattern = f"%{self._escape_like(query.search)}%"
+            stmt = stmt.where(or_(
+                Task.title.ilike(pattern, escape="\\"),
+                Task.description.ilike(pattern, escape="\\"),
+            ))
+        return stmt
+
+    def _seek_condition(self, query: TaskQuery, sort_value: Any, task_id: UUID):
+        """Build the keyset predicate selecting rows after (sort_value, task_id)"""
+        sort_key = self._sort_key(query.sort_by)
+        if query.sort_by == TaskSortField.created_at:
+            sort_value = self._timestamp_bound(sort_value)
+        # The leading range on the sort key keeps the seek on its index;
+        # id only breaks ties between rows with the same sort value.
+        if query.order == SortOrder.desc:
+            return and_(
+                sort_key <= sort_value,
+                or_(sort_key < sort_value, and_(sort_key == sort_value, Task.id < task_id)),
+            )
+        return and_(
+            sort_key >= sort_value,
+            or_(sort_key > sort_value, and_(sort_key == sort_value, Task.id > task_id)),
+        )
+
+    @staticmethod
+    def _sort_key(sort_by: TaskSortField):
+        if sort_by == TaskSortField.priority:
+            return literal_column(f"({PRIORITY_RANK_SQL})")
+        return getattr(Task, sort_by.value)
+
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def _timestamp_bound(self, value: datetime):
+        """Bind a timestamp so it compares equal to the stored column value"""
+        column_type = Task.created_at.type
+        if value.microsecond == 0:
+            # SQLite keeps timestamps as text and server_default rows have no
+            # fractional part, so the bound value must be rendered the same way.
+            column_type = column_type.with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite")
+        return bindparam(None, value, type_=column_type)
+
     async def update_task(self, task_id: UUID, task_update: TaskUpdate) -> Optional[Task]:
         """Update a task"""
-        # Get the task to update
-        db_task = await self.get_task_by_id(task_id)
-        if not db_task:
-            return None
-
         # Prepare update data, excluding None values
         update_data = task_update.model_dump(exclude_unset=True)
+        if not update_data:
+            return await self.get_task_by_id(task_id)
 
-        # Update the task
         stmt = update(Task).where(Task.id == task_id).values(**update_data)
-        await self.db_session.execute(stmt)
+        return await self._update_returning(stmt)
 
-        # Commit the transaction before refreshing
-        await self.db_session.commit()
-
-        # Refresh the task to get updated values
-        await self.db_session.refresh(db_task)
+    async def toggle_task(self, task_id: UUID) -> Optional[Task]:
+        """Flip a task's completion status in the database, without reading it first"""
+        stmt = update(Task).where(Task.id == task_id).values(completed=not_(Task.completed))
+        return await self._update_returning(stmt)
 
+    async def _update_returning(self, stmt) -> Optional[Task]:
+        """Run an UPDATE and load the new row from its RETURNING clause, then commit"""
+        stmt = stmt.returning(Task).execution_options(
+            synchronize_session=False, populate_existing=True
+        )
+        result = await self.db_session.execute(stmt)
+        db_task = result.scalar_one_or_none()
+        await self._commit()
+        if db_task is not None:
+            self._publish_task("updated", db_task)
         return db_task
 
     async def delete_task(self, task_id: UUID) -> bool:
         """Delete a task"""
         stmt = delete(Task).where(Task.id == task_id)
         result = await self.db_session.execute(stmt)
-        await self.db_session.commit()
-        return result.rowcount > 0
\ No newline at end of file
+        await self._commit()
+        deleted = result.rowcount > 0
+        if deleted:
+            self._publish("deleted", {"id": str(task_id)})
+        return deleted
+
+    async def apply_batch(
+        self,
+        creates: List[TaskCreate],
+        updates: List[Tuple[UUID, TaskUpdate]],
+        toggle_ids: List[UUID],
+        delete_ids: List[UUID],
+    ) -> Tuple[List[Task], Set[UUID], Set[UUID], Set[UUID], Dict[UUID, Task]]:
+        """
+        Apply a batch of writes as set-based statements in a single transaction.
+
+        Operations are grouped by kind and run as creates, updates, toggles and
+        then deletes, so each task may appear in at most one of them (see
+        TaskBatchRequest). Returns the created tasks, the ids that were updated,
+        toggled and deleted, and the final state of every surviving touched task.
+        """
+        try:
+            created: List[Task] = []
+            if creates:
+                rows = [dict(task.model_dump(), id=uuid4()) for task in creates]
+                result = await self.db_session.scalars(
+                    insert(Task).returning(Task, sort_by_parameter_order=True), rows
+                )
+                created = result.all()
+
+            updated_ids: Set[UUID] = set()
+            if updates:
+                update_ids = {task_id for task_id, _ in updates}
+                result = await self.db_session.execute(select(Task.id).where(Task.id.in_(update_ids)))
+                updated_ids = set(result.scalars().all())
+
+                # Group by the set of columns touched so each group is one executemany
+                groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+                for task_id, task_update in updates:
+                    values = task_update.model_dump(exclude_unset=True)
+                    if task_id in updated_ids and values:
+                        groups.setdefault(tuple(sorted(values)), []).append(dict(values, _id=task_id))
+                for columns, params in groups.items():
+                    stmt = (
+                        update(Task.__table__)
+                        .where(Task.__table__.c.id == bindparam("_id"))
+                        .values({name: bindparam(name) for name in columns})
+                    )
+                    await self.db_session.execute(stmt, params)
+
+            toggled_ids: Set[UUID] = set()
+            if toggle_ids:
+                result = await self.db_session.execute(
+                    update(Task)
+                    .where(Task.id.in_(set(toggle_ids)))
+                    .values(completed=not_(Task.completed))
+                    .returning(Task.id)
+                    .execution_options(synchronize_session=False)
+                )
+                toggled_ids = set(result.scalars().all())
+
+            deleted_ids: Set[UUID] = set()
+            if delete_ids:
+                result = await self.db_session.execute(
+                    delete(Task).where(Task.id.in_(set(delete_ids))).returning(Task.id)
+                )
+                deleted_ids = set(result.scalars().all())
+
+            final: Dict[UUID, Task] = {}
+            touched = (updated_ids | toggled_ids) - deleted_ids
+            if touched:
+                result = await self.db_session.execute(
+                    select(Task).where(Task.id.in_(touched)).execution_options(populate_existing=True)
+                )
+                final = {task.id: task for task in result.scalars().all()}
+
+            await self._commit()
+            for db_task in created:
+                self._publish_task("created", db_task)
+            for db_task in final.values():
+                self._publish_task("updated", db_task)
+            for task_id in deleted_ids:
+                self._publish("deleted", {"id": str(task_id)})
+            return created, updated_ids, toggled_ids, deleted_ids, final
+        except Exception:
+            await self.rollback()
+            raise
+
+    async def insert_task_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert already-validated task rows in one round trip and commit.
+
+        PostgreSQL takes them through COPY; other databases get a single
+        executemany INSERT. Timestamps come from the column defaults.
+        """
+        if not rows:
+            return 0
+        if self.db_session.bind.dialect.name == "postgresql":
+            columns = ["id", "title", "description", "completed", "priority"]
+            records = [
+                (uuid4(), row["title"], row["description"], row["completed"], row["priority"])
+                for row in rows
+            ]
+            connection = await self.db_session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                Task.__tablename__, records=records, columns=columns
+            )
+        else:
+            await self.db_session.execute(insert(Task.__table__), [{"id": uuid4(), **row} for row in rows])
+        await self._commit()
+        self._publish("bulk_created", {"affected": len(rows)})
+        return len(rows)
+
+    async def update_tasks_where(self, query: TaskQuery, values: TaskBulkUpdate) -> int:
+        """Update every task matching the query's filters in one statement"""
+        update_data = values.model_dump(exclude_unset=True)
+        if not update_data:
+            return 0
+        stmt = self._apply_filters(update(Task), query).values(**update_data)
+        result = await self.db_session.execute(stmt.execution_options(synchronize_session=False))
+        await self._commit()
+        if result.rowcount:
+            self._publish_bulk("bulk_updated", query, result.rowcount, update_data)
+        return result.rowcount
+
+    async def delete_tasks_where(self, query: TaskQuery) -> int:
+        """Delete every task matching the query's filters in one statement"""
+        stmt = self._apply_filters(delete(Task), query)
+        result = await self.db_session.execute(stmt.execution_options(synchronize_session=False))
+        await self._commit()
+        if result.rowcount:
+            self._publish_bulk("bulk_deleted", query, result.rowcount)
+        return result.rowcount
+
+    async def _commit(self) -> None:
+        if self.autocommit:
+            await self.db_session.commit()
+
+    def _publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        if self.autocommit:
+            self.events.publish(event_type, data)
+        else:
+            self._pending_events.append((event_type, data))
+
+    def _publish_task(self, event_type: str, db_task: Task) -> None:
+        task = TaskResponse.model_validate(db_task).model_dump(mode="json")
+        self._publish(event_type, {"task": task})
+
+    def _publish_bulk(
+        self, event_type: str, query: TaskQuery, affected: int, values: Optional[Dict[str, Any]] = None
+    ) -> None:
+        # The affected ids are not known without an extra query; clients re-apply the filter
+        data = {
+            "filter": query.model_dump(mode="json", include={"completed", "priority", "search"}),
+            "affected": affected,
+        }
+        if values is not None:
+            data["values"] = values
+        self._publish(event_type, data)
@@ -1,9 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import insert, update, or_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
+from app.core.security import hash_password, verify_password
 from app.schemas.user import UserCreate, UserUpdate
-from typing import Optional
+from app.utils.exceptions import UserAlreadyExistsException
+from typing import Optional, Tuple
+from uuid import uuid4
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,42 +37,60 @@ class UserRepository:
         return result.scalar_one_or_none()
 
     async def create_user(self, user_data: UserCreate) -> Optional[User]:
-        """Create a new user"""
+        """
+        Create a new user with a single INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+        The unique indexes on email and username decide conflicts, so there is no
+        check-then-insert race. Only when nothing was inserted is a second query
+        run to report which field clashed.
+        """
+        values = {
+            "id": uuid4(),
+            "email": user_data.email,
+            "username": user_data.username,
+            "password_hash": await hash_password(user_data.password),
+            "is_active": True,
+        }
         try:
-            # Check if user with email already exists
-            existing_user = await self.get_user_by_email(user_data.email)
-            if existing_user:
-                logger.warning(f"User with email {user_data.email} already exists")
-                return None
-            
-            # Check if user with username already exists
-            existing_user = await self.get_user_by_username(user_data.username)
-            if existing_user:
-                logger.warning(f"User with username {user_data.username} already exists")
-                return None
+            dialect = self.db_session.bind.dialect.name
+            if dialect in ("postgresql", "sqlite"):
+                dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+                stmt = dialect_insert(User).values(**values).on_conflict_do_nothing().returning(User)
+                user = (await self.db_session.execute(stmt)).scalar_one_or_none()
+            else:
+                try:
+                    stmt = insert(User).values(**values).returning(User)
+                    user = (await self.db_session.execute(stmt)).scalar_one()
+                except IntegrityError:
+                    await self.db_session.rollback()
+                    user = None
 
-            # Create new user
-            user = User(
-                email=user_data.email,
-                username=user_data.username
-            )
-            user.set_password(user_data.password)
+            if user is None:
+                await self.db_session.rollback()
+                raise UserAlreadyExistsException(await self._conflicting_field(user_data))
 
-            self.db_session.add(user)
             await self.db_session.commit()
-            await self.db_session.refresh(user)
-            
             logger.info(f"Created new user with email: {user_data.email}")
             return user
-        except IntegrityError as e:
-            logger.error(f"Integrity error during user creation: {e}")
-            await self.db_session.rollback()
-            return None
+        except UserAlreadyExistsException:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error during user creation: {e}")
             await self.db_session.rollback()
             return None
 
+    async def _conflicting_field(self, user_data: UserCreate) -> str:
+        """Which unique field of a failed signup is already taken"""
+        # At most two rows can match: one per unique index
+        stmt = select(User.email).where(
+            or_(User.email == user_data.email, User.username == user_data.username)
+        )
+        emails = (await self.db_session.execute(stmt)).scalars().all()
+        if emails and user_data.email not in emails:
+            return "username"
+        # Report email when it clashes, or when the clashing row has since been deleted
+        return "email"
+
     async def update_user(self, user_id: str, user_data: UserUpdate) -> Optional[User]:
         """Update a user's information"""
         try:
@@ -106,9 +129,29 @@ class UserRepository:
             await self.db_session.rollback()
             return False
 
-    async def authenticate_user(self, email: str, password: str) -> Optional[User]:
-        """Authenticate a user by email and password"""
+    async def authenticate_user(self, email: str, password: str) -> Tuple[Optional[User], Optional[str]]:
+        """
+        Authenticate a user by email and password.
+
+        Returns the user (None if authentication failed) and, when the stored hash
+        used outdated argon2 parameters, a replacement hash for the caller to save.
+        """
         user = await self.get_user_by_email(email)
-        if not user or not user.verify_password(password):
-            return None
-        return user
\ No newline at end of file
+        if not user:
+            return None, None
+        verified, new_hash = await verify_password(password, user.password_hash)
+        if not verified:
+            return None, None
+        return user, new_hash
+
+    async def update_password_hash(self, user_id, old_hash: str, new_hash: str) -> bool:
+        """Replace a user's password hash, unless it changed since `old_hash` was read"""
+        stmt = (
+            update(User)
+            .where(User.id == user_id, User.password_hash == old_hash)
+            .values(password_hash=new_hash)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+        await self.db_session.commit()
+        return result.rowcount == 1
\ No newline at end of file
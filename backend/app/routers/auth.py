@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_async_session
-from app.schemas.user import UserCreate, UserLogin, UserLoginResponse
+from app.db.database import get_async_session, get_read_session
+from app.schemas.user import (
+    UserCreate, UserLogin, UserLoginResponse, RefreshRequest, SignoutRequest, TokenClaims, TokenPair, CurrentUser
+)
 from app.services.user_service import UserService
 from app.repositories.user_repository import UserRepository
-from typing import Dict
+from app.auth import REFRESH_TOKEN, token_signer
+from app.auth.dependencies import (
+    enforce_login_throttle, get_current_user, get_optional_token_claims, revoke_token, verify_token
+)
+from app.utils.exceptions import InvalidTokenException, UserAlreadyExistsException
+from typing import Dict, Optional
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -15,37 +22,45 @@ def get_user_service(db_session: AsyncSession = Depends(get_async_session)):
     return UserService(user_repo)
 
 
+def get_user_read_service(db_session: AsyncSession = Depends(get_read_session)):
+    """Dependency to get a user service for read-only endpoints (may use the replica)"""
+    user_repo = UserRepository(db_session)
+    return UserService(user_repo)
+
+
 @router.post("/signup", response_model=UserLoginResponse, status_code=201)
 async def signup(
+    request: Request,
     user_create: UserCreate,
     user_service: UserService = Depends(get_user_service)
 ):
     """Register a new user"""
+    # Throttle before any hashing so floods can't saturate the argon2 workers
+    await enforce_login_throttle(request, user_create.email)
     try:
-        # Check if user already exists
-        existing_user = await user_service.get_user_by_email(user_create.email)
-        if existing_user:
+        # Create new user; the insert itself detects an existing email or username
+        try:
+            user = await user_service.create_user(user_create)
+        except UserAlreadyExistsException as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A user with this email already exists"
+                detail=str(e)
             )
-
-        # Create new user
-        user = await user_service.create_user(user_create)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to create user"
             )
 
-        # Return user info (without password)
+        # Return user info (without password) and a token pair for later requests
         return UserLoginResponse(
             id=user.id,
             email=user.email,
             username=user.username,
             is_active=user.is_active,
             created_at=user.created_at,
-            updated_at=user.updated_at
+            updated_at=user.updated_at,
+            tokens=token_signer.issue_pair(user.id, user.email, user.username)
         )
     except HTTPException:
         raise
@@ -58,10 +73,12 @@ async def signup(
 
 @router.post("/signin", response_model=UserLoginResponse)
 async def signin(
+    request: Request,
     user_login: UserLogin,
-    user_service: UserService = Depends(get_user_service)
+    user_service: UserService = Depends(get_user_read_service)
 ):
     """Authenticate a user and return user info"""
+    await enforce_login_throttle(request, user_login.email)
     try:
         # Authenticate user
         user = await user_service.authenticate_user(user_login.email, user_login.password)
@@ -77,14 +94,15 @@ async def signin(
                 detail="Account is deactivated"
             )
 
-        # Return user info (without password)
+        # Return user info (without password) and a token pair for later requests
         return UserLoginResponse(
             id=user.id,
             email=user.email,
             username=user.username,
             is_active=user.is_active,
             created_at=user.created_at,
-            updated_at=user.updated_at
+            updated_at=user.updated_at,
+            tokens=token_signer.issue_pair(user.id, user.email, user.username)
         )
     except HTTPException:
         raise
@@ -95,7 +113,44 @@ async def signin(
         )
 
 
+@router.post("/refresh", response_model=TokenPair)
+async def refresh(
+    refresh_request: RefreshRequest,
+    user_service: UserService = Depends(get_user_read_service)
+):
+    """Exchange a refresh token for a new token pair; the old refresh token is revoked"""
+    try:
+        claims = await verify_token(refresh_request.refresh_token, REFRESH_TOKEN)
+    except InvalidTokenException as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+
+    # Refreshing is rare, so this is where deactivated accounts are shut out
+    user = await user_service.get_user_by_id(claims.sub)
+    if not user or not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Account is deactivated")
+
+    await revoke_token(claims)
+    return token_signer.issue_pair(user.id, user.email, user.username)
+
+
+@router.get("/me", response_model=CurrentUser)
+async def me(claims: TokenClaims = Depends(get_current_user)):
+    """The signed-in user, read from the access token"""
+    return CurrentUser(id=claims.sub, email=claims.email, username=claims.username)
+
+
 @router.post("/signout")
-async def signout():
-    """Simple signout endpoint - no session management needed for this basic implementation"""
+async def signout(
+    signout_request: Optional[SignoutRequest] = None,
+    claims: Optional[TokenClaims] = Depends(get_optional_token_claims)
+):
+    """Revoke the bearer access token and, if given, the refresh token"""
+    if claims is not None:
+        await revoke_token(claims)
+    if signout_request is not None and signout_request.refresh_token:
+        try:
+            await revoke_token(await verify_token(signout_request.refresh_token, REFRESH_TOKEN))
+        except InvalidTokenException:
+            # Already expired or revoked; nothing left to do
+            pass
     return {"message": "Successfully signed out"}
\ No newline at end of file
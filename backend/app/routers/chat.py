@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+import json
 from typing import Optional
 import sys
 import os
@@ -8,7 +10,8 @@ import os
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 sys.path.insert(0, backend_dir)
 
-from mcp.agent import get_gemini_response
+from mcp.agent import get_gemini_response, stream_gemini_response
+from app.db.routing import mark_primary_write
 
 router = APIRouter()
 
@@ -19,12 +22,37 @@ class ChatResponse(BaseModel):
     response: str
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat_with_agent(request: ChatRequest):
+async def chat_with_agent(request: ChatRequest, http_request: Request):
     """
     Chat with the Gemini agent that can interact with the todo app
     """
+    # Agent tools may write, so follow-up reads should see them
+    mark_primary_write(http_request)
     try:
         response = await get_gemini_response(request.message)
         return ChatResponse(response=response)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error processing chat request: {str(e)}")
+
+
+@router.post("/chat/stream")
+async def chat_with_agent_stream(request: ChatRequest, http_request: Request):
+    """
+    Chat with the agent, receiving the reply as Server-Sent Events
+
+    Emits `token` events with pieces of a free-text answer as they are generated,
+    a `message` event with the outcome of a command, an `error` event on failure,
+    and a final `done` event.
+    """
+    mark_primary_write(http_request)
+
+    async def events():
+        async for event, text in stream_gemini_response(request.message):
+            yield f"event: {event}\ndata: {json.dumps({'text': text})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,23 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Union
 from uuid import UUID
 
-from app.db.database import get_async_session
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.db.database import (
+    get_async_session, get_primary_read_session, get_read_session, read_session_factory, reads_from_replica
+)
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskPage, TaskSearchPage, TaskQuery, TaskSortField, SortOrder,
+    TaskBatchRequest, TaskBatchResponse, TaskBulkUpdate, TaskBulkResult, TaskChanges, ExportFormat,
+    TaskImportResult
+)
 from app.services.task_service import TaskService
 from app.repositories.task_repository import TaskRepository
-from app.utils.exceptions import TaskNotFoundException
+from app.repositories.cached_task_repository import CachedTaskRepository
+from app.utils.exceptions import TaskNotFoundException, InvalidCursorException, SyncCursorExpiredException
+from app.utils.etag import content_etag, etag_matches
+from app.events import task_events
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
 
 def get_task_service(db_session: AsyncSession = Depends(get_async_session)):
     """Dependency to get the task service with repository"""
-    task_repo = TaskRepository(db_session)
+    task_repo = CachedTaskRepository(db_session)
     return TaskService(task_repo)
 
 
+def get_task_read_service(request: Request, db_session: AsyncSession = Depends(get_read_session)):
+    """Dependency to get a task service for read-only endpoints (may use the replica)"""
+    if reads_from_replica(request):
+        # A lagging replica would store rows older than the cache version they
+        # are keyed by, so only primary reads fill the cache
+        return TaskService(TaskRepository(db_session))
+    task_repo = CachedTaskRepository(db_session)
+    return TaskService(task_repo)
+
+
+def get_task_sync_service(db_session: AsyncSession = Depends(get_primary_read_session)):
+    """
+    Dependency to get a task service for incremental sync, always on the primary:
+    a cursor taken past rows a lagging replica doesn't have yet would skip them for good
+    """
+    return TaskService(TaskRepository(db_session))
+
+
 @router.post("/tasks", response_model=TaskResponse, status_code=201)
 async def create_task(
     task_create: TaskCreate,
@@ -30,30 +61,213 @@ async def create_task(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/tasks", response_model=List[TaskResponse])
+@router.get("/tasks", response_model=Union[TaskPage, List[TaskResponse]])
 async def get_all_tasks(
-    task_service: TaskService = Depends(get_task_service)
+    completed: Optional[bool] = None,
+    priority: Optional[str] = Query(None, min_length=1, max_length=20),
+    search: Optional[str] = Query(None, min_length=1, max_length=255),
+    sort_by: TaskSortField = TaskSortField.created_at,
+    order: SortOrder = SortOrder.desc,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    task_service: TaskService = Depends(get_task_read_service)
 ):
-    """Get all tasks"""
+    """Get tasks filtered and sorted server-side, paginated when `limit` or `cursor` is given"""
+    query = TaskQuery(
+        completed=completed, priority=priority, search=search, sort_by=sort_by, order=order
+    )
     try:
-        return await task_service.get_all_tasks()
+        # Pre-serialized bodies; response_model still documents the shape
+        if limit is None and cursor is None:
+            # The whole list costs O(N) anyway; a one-query aggregate ETag lets
+            # a 304 skip loading and encoding the rows
+            etag, load_body = await task_service.get_all_tasks_json(query)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            body = await load_body()
+        else:
+            # A page hashes its own body so it never pays for an aggregate over
+            # the whole filtered set; page N still costs the same as page 1
+            body = await task_service.get_tasks_page_json(query, limit or DEFAULT_PAGE_SIZE, cursor)
+            etag = content_etag(body)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Log the actual error for debugging
         print(f"Database error in get_all_tasks: {str(e)}")
         raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
 
 
+@router.post("/tasks:batch", response_model=TaskBatchResponse)
+async def batch_tasks(
+    batch: TaskBatchRequest,
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Apply a list of create/update/toggle/delete operations atomically"""
+    try:
+        return await task_service.execute_batch(batch)
+    except Exception as e:
+        print(f"Database error in batch_tasks: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
+
+
+@router.patch("/tasks", response_model=TaskBulkResult)
+async def bulk_update_tasks(
+    values: TaskBulkUpdate,
+    completed: Optional[bool] = None,
+    priority: Optional[str] = Query(None, min_length=1, max_length=20),
+    search: Optional[str] = Query(None, min_length=1, max_length=255),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Update every task matching the filters in a single statement (e.g. complete all)"""
+    query = TaskQuery(completed=completed, priority=priority, search=search)
+    try:
+        return await task_service.update_tasks_where(query, values)
+    except Exception as e:
+        print(f"Database error in bulk_update_tasks: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
+
+
+@router.delete("/tasks", response_model=TaskBulkResult)
+async def bulk_delete_tasks(
+    completed: Optional[bool] = None,
+    priority: Optional[str] = Query(None, min_length=1, max_length=20),
+    search: Optional[str] = Query(None, min_length=1, max_length=255),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Delete every task matching the filters in a single statement (e.g. delete all completed)"""
+    if completed is None and priority is None and search is None:
+        raise HTTPException(status_code=400, detail="At least one filter is required for bulk delete")
+    query = TaskQuery(completed=completed, priority=priority, search=search)
+    try:
+        return await task_service.delete_tasks_where(query)
+    except Exception as e:
+        print(f"Database error in bulk_delete_tasks: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
+
+
+@router.get("/tasks/events")
+async def task_event_stream(
+    last_event_id: Optional[str] = Header(None),
+    since: Optional[str] = Query(None, description="Event id to resume after (alternative to Last-Event-ID)"),
+):
+    """Stream task create/update/delete events as Server-Sent Events"""
+    return StreamingResponse(
+        task_events.subscribe(last_event_id or since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+@router.get("/tasks/export")
+async def export_tasks(
+    request: Request,
+    format: ExportFormat = ExportFormat.ndjson,
+    gzip: bool = False,
+    completed: Optional[bool] = None,
+    priority: Optional[str] = Query(None, min_length=1, max_length=20),
+    search: Optional[str] = Query(None, min_length=1, max_length=255),
+    sort_by: TaskSortField = TaskSortField.created_at,
+    order: SortOrder = SortOrder.desc,
+):
+    """Stream every matching task as NDJSON or CSV without loading the table into memory"""
+    query = TaskQuery(
+        completed=completed, priority=priority, search=search, sort_by=sort_by, order=order
+    )
+    session_factory = read_session_factory(request)
+
+    async def body():
+        # The session lives as long as the stream, not the request handler
+        async with session_factory() as db_session:
+            task_service = TaskService(TaskRepository(db_session))
+            async for chunk in task_service.export_tasks(query, format, compress=gzip):
+                yield chunk
+
+    filename = f"tasks.{format.value}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body(), media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
+
+
+@router.post("/tasks/import", response_model=TaskImportResult)
+async def import_tasks(
+    request: Request,
+    format: ExportFormat = ExportFormat.ndjson,
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Bulk-create tasks from an NDJSON or CSV request body, reporting invalid rows"""
+    try:
+        return await task_service.import_tasks(request.stream(), format)
+    except Exception as e:
+        print(f"Database error in import_tasks: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
+
+
+@router.get("/tasks/changes", response_model=TaskChanges)
+async def get_task_changes(
+    since: Optional[str] = Query(None, description="Cursor from a previous sync; omit for a full snapshot"),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    task_service: TaskService = Depends(get_task_sync_service)
+):
+    """Tasks created/updated and ids deleted since the cursor, for incremental client sync"""
+    try:
+        return await task_service.get_changes(since, limit)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SyncCursorExpiredException as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except Exception as e:
+        print(f"Database error in get_task_changes: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
+
+
+@router.get("/tasks/search", response_model=TaskSearchPage)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    task_service: TaskService = Depends(get_task_read_service)
+):
+    """Full-text search over task titles and descriptions, ranked by relevance"""
+    try:
+        return await task_service.search_tasks(q, limit, offset)
+    except Exception as e:
+        print(f"Database error in search_tasks: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable. Please try again later.")
+
+
 @router.get("/tasks/{task_id}", response_model=TaskResponse)
 async def get_task_by_id(
     task_id: UUID,
-    task_service: TaskService = Depends(get_task_service)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    task_service: TaskService = Depends(get_task_read_service)
 ):
     """Get a specific task by ID"""
     try:
+        if if_none_match:
+            etag = await task_service.get_task_etag(task_id)
+            if etag is not None and etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+
         task = await task_service.get_task_by_id(task_id)
         if not task:
             raise HTTPException(status_code=404, detail=f"Task with id {task_id} not found")
+        response.headers["ETag"] = task_service.task_etag(task.id, task.updated_at)
         return task
+    except HTTPException:
+        raise
     except ValueError:
         # Raised when task_id is not a valid UUID
         raise HTTPException(status_code=400, detail="Invalid task ID format")
@@ -79,6 +293,8 @@ async def update_task(
         if not task:
             raise HTTPException(status_code=404, detail=f"Task with id {task_id} not found")
         return task
+    except HTTPException:
+        raise
     except ValueError:
         # Raised when task_id is not a valid UUID
         raise HTTPException(status_code=400, detail="Invalid task ID format")
@@ -99,13 +315,12 @@ async def toggle_task_completion(
 ):
     """Toggle the completion status of a task"""
     try:
-        task = await task_service.get_task_by_id(task_id)
+        task = await task_service.toggle_task(task_id)
         if not task:
             raise HTTPException(status_code=404, detail=f"Task with id {task_id} not found")
-
-        # Update the completion status
-        updated_task = await task_service.update_task(task_id, TaskUpdate(completed=not task.completed))
-        return updated_task
+        return task
+    except HTTPException:
+        raise
     except ValueError:
         # Raised when task_id is not a valid UUID
         raise HTTPException(status_code=400, detail="Invalid task ID format")
@@ -130,6 +345,8 @@ async def delete_task(
         if not deleted:
             raise HTTPException(status_code=404, detail=f"Task with id {task_id} not found")
         return
+    except HTTPException:
+        raise
     except ValueError:
         # Raised when task_id is not a valid UUID
         raise HTTPException(status_code=400, detail="Invalid task ID format")
@@ -1,8 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from pydantic.config import ConfigDict
-from typing import Optional
+from typing import Annotated, List, Literal, Optional, Union
 from uuid import UUID
 from datetime import datetime
+from enum import Enum
 
 
 class TaskBase(BaseModel):
@@ -28,4 +29,128 @@ class TaskResponse(TaskBase):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class TaskSortField(str, Enum):
+    created_at = "created_at"
+    priority = "priority"
+    title = "title"
+
+
+class SortOrder(str, Enum):
+    asc = "asc"
+    desc = "desc"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class TaskQuery(BaseModel):
+    completed: Optional[bool] = None
+    priority: Optional[str] = Field(None, min_length=1, max_length=20)
+    search: Optional[str] = Field(None, min_length=1, max_length=255)
+    sort_by: TaskSortField = TaskSortField.created_at
+    order: SortOrder = SortOrder.desc
+
+
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = None
+
+
+
+class TaskSearchPage(BaseModel):
+    items: List[TaskResponse]
+    next_offset: Optional[int] = None
+
+
+
+class TaskCreateOperation(BaseModel):
+    op: Literal["create"]
+    task: TaskCreate
+
+
+class TaskUpdateOperation(BaseModel):
+    op: Literal["update"]
+    id: UUID
+    task: TaskUpdate
+
+
+class TaskToggleOperation(BaseModel):
+    op: Literal["toggle"]
+    id: UUID
+
+
+class TaskDeleteOperation(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+TaskBatchOperation = Annotated[
+    Union[TaskCreateOperation, TaskUpdateOperation, TaskToggleOperation, TaskDeleteOperation],
+    Field(discriminator="op"),
+]
+
+
+class TaskBatchRequest(BaseModel):
+    operations: List[TaskBatchOperation] = Field(..., min_length=1, max_length=1000)
+
+    @model_validator(mode="after")
+    def check_one_operation_per_task(self):
+        # Operations run grouped by kind rather than in request order, so two
+        # on the same task would not compose the way the request reads
+        seen = set()
+        for index, operation in enumerate(self.operations):
+            task_id = getattr(operation, "id", None)
+            if task_id is None:
+                continue
+            if task_id in seen:
+                raise ValueError(
+                    f"operations[{index}] targets task {task_id} again; "
+                    "send operations on the same task in separate batches"
+                )
+            seen.add(task_id)
+        return self
+
+
+class TaskBatchResult(BaseModel):
+    index: int
+    op: str
+    success: bool
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    results: List[TaskBatchResult]
+
+
+class TaskBulkUpdate(BaseModel):
+    completed: Optional[bool] = None
+    priority: Optional[str] = Field(None, min_length=1, max_length=20)
+
+
+class TaskBulkResult(BaseModel):
+    affected: int
+
+
+
+class TaskChanges(BaseModel):
+    updated: List[TaskResponse]
+    deleted: List[UUID]
+    next_cursor: str
+    has_more: bool
+
+
+
+class TaskImportError(BaseModel):
+    line: int
+    error: str
+
+
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TaskImportError]
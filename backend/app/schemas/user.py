@@ -34,6 +34,37 @@ class UserResponse(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class TokenClaims(BaseModel):
+    sub: UUID
+    email: str
+    username: str
+    type: str
+    jti: str
+    iat: int
+    exp: int
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class SignoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
+class CurrentUser(BaseModel):
+    id: UUID
+    email: str
+    username: str
+
+
 class UserLoginResponse(BaseModel):
     id: UUID
     email: EmailStr
@@ -42,5 +73,6 @@ class UserLoginResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     message: str = "Login successful"
+    tokens: Optional[TokenPair] = None
 
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
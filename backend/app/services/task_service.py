@@ -1,7 +1,27 @@
-from typing import List, Optional
+import csv
+import io
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from pydantic import ValidationError
+from datetime import datetime, timedelta, timezone
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskPage, TaskQuery, TaskSearchPage,
+    TaskBatchRequest, TaskBatchResponse, TaskBatchResult, TaskBulkUpdate, TaskBulkResult, TaskChanges,
+    ExportFormat, TaskImportError, TaskImportResult
+)
 from app.repositories.task_repository import TaskRepository
+from app.utils.pagination import encode_cursor, decode_cursor, encode_sync_cursor, decode_sync_cursor
+from app.utils.exceptions import SyncCursorExpiredException
+from app.core.settings import settings
+from app.utils.etag import make_etag
+from app.utils.serialization import dump_json
+
+
+# Rows validated and written per round trip during an import
+IMPORT_CHUNK_SIZE = 5000
+# Per-row errors listed in an import result; the rest are only counted
+MAX_REPORTED_IMPORT_ERRORS = 1000
 
 
 class TaskService:
@@ -20,11 +40,169 @@ class TaskService:
             return TaskResponse.model_validate(db_task)
         return None
 
-    async def get_all_tasks(self) -> List[TaskResponse]:
-        """Get all tasks"""
-        db_tasks = await self.task_repository.get_all_tasks()
+    async def find_tasks_by_title(self, title: str, limit: int = 10) -> List[TaskResponse]:
+        """Tasks with exactly this title, ignoring case"""
+        db_tasks = await self.task_repository.find_tasks_by_title(title, limit)
+        return [TaskResponse.model_validate(task) for task in db_tasks]
+
+    async def find_tasks_by_titles(self, titles: List[str]) -> Dict[str, TaskResponse]:
+        """The newest task for each title, ignoring case, keyed by the title as given"""
+        db_tasks = await self.task_repository.find_tasks_by_titles(titles)
+        return {title: TaskResponse.model_validate(task) for title, task in db_tasks.items()}
+
+    async def get_all_tasks(self, query: Optional[TaskQuery] = None) -> List[TaskResponse]:
+        """Get all tasks matching the query"""
+        db_tasks = await self.task_repository.get_all_tasks(query)
         return [TaskResponse.model_validate(task) for task in db_tasks]
 
+    async def get_all_tasks_json(self, query: TaskQuery) -> Tuple[str, Callable[[], Awaitable[bytes]]]:
+        """
+        ETag and a body loader for get_all_tasks, serialized straight from column rows.
+
+        The ETag comes from a one-query aggregate read before the rows (or from
+        the same cache entry as the body), so a 304 skips loading and encoding
+        them and a body is never paired with an ETag newer than it. Rows come
+        from the database with the types TaskResponse declares, so validating
+        them again would only cost time on large lists.
+        """
+        version, load = await self.task_repository.get_task_list_json(query)
+        return make_etag("tasks", query.model_dump(mode="json"), version), load
+
+    async def export_tasks(
+        self, query: TaskQuery, export_format: ExportFormat, compress: bool = False
+    ) -> AsyncIterator[bytes]:
+        """Stream every matching task as NDJSON or CSV, one encoded chunk per fetched batch"""
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        fields = list(TaskResponse.model_fields)
+        if export_format == ExportFormat.csv:
+            yield self._compress(compressor, self._csv_chunk([fields]))
+
+        async for rows in self.task_repository.stream_task_rows(query):
+            if export_format == ExportFormat.csv:
+                chunk = self._csv_chunk([[self._csv_value(row[field]) for field in fields] for row in rows])
+            else:
+                chunk = b"".join(dump_json(row) + b"\n" for row in rows)
+            yield self._compress(compressor, chunk)
+
+        if compressor is not None:
+            yield compressor.flush()
+
+    @staticmethod
+    def _compress(compressor, chunk: bytes) -> bytes:
+        return compressor.compress(chunk) if compressor is not None else chunk
+
+    @staticmethod
+    def _csv_chunk(records: List[List[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(records)
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    def _csv_value(value: Any) -> Any:
+        # Keep CSV cells consistent with the JSON representation
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    async def get_tasks_page(self, query: TaskQuery, limit: int, cursor: Optional[str] = None) -> TaskPage:
+        """Get one page of tasks matching the query, continuing from an opaque cursor"""
+        sort_by = query.sort_by
+        after = decode_cursor(cursor, sort_by.value) if cursor else None
+        # Fetch one extra row to know whether another page follows
+        db_tasks = await self.task_repository.get_tasks_page(query, limit + 1, after)
+        next_cursor = None
+        if len(db_tasks) > limit:
+            db_tasks = db_tasks[:limit]
+            last = db_tasks[-1]
+            next_cursor = encode_cursor(
+                sort_by.value, self.task_repository.sort_value(last, sort_by), last.id
+            )
+        return TaskPage(
+            items=[TaskResponse.model_validate(task) for task in db_tasks],
+            next_cursor=next_cursor,
+        )
+
+    async def get_tasks_page_json(self, query: TaskQuery, limit: int, cursor: Optional[str] = None) -> bytes:
+        """JSON body for get_tasks_page"""
+        page = await self.get_tasks_page(query, limit, cursor)
+        return dump_json(page.model_dump())
+
+    async def search_tasks(self, search: str, limit: int, offset: int = 0) -> TaskSearchPage:
+        """Full-text search for tasks, ranked by relevance"""
+        db_tasks = await self.task_repository.search_tasks(search, limit + 1, offset)
+        next_offset = None
+        if len(db_tasks) > limit:
+            db_tasks = db_tasks[:limit]
+            next_offset = offset + limit
+        return TaskSearchPage(
+            items=[TaskResponse.model_validate(task) for task in db_tasks],
+            next_offset=next_offset,
+        )
+
+    async def get_changes(self, cursor: Optional[str], limit: int) -> TaskChanges:
+        """Tasks written and deleted since the cursor; without a cursor, every task"""
+        # Rows are stamped by the database, so the cut-off uses its clock too
+        now = self._as_utc(await self.task_repository.get_database_time())
+        until = now - timedelta(seconds=settings.sync_commit_skew_seconds)
+        if cursor:
+            updated_after, deleted_after = decode_sync_cursor(cursor)
+            horizon = now - timedelta(days=settings.tombstone_retention_days)
+            if self._as_utc(deleted_after[0]) < horizon:
+                # Tombstones this client never saw may already be purged
+                raise SyncCursorExpiredException(cursor)
+        else:
+            updated_after, deleted_after = None, None
+
+        db_tasks, tombstones = await self.task_repository.get_changes(
+            updated_after, deleted_after, until, limit
+        )
+
+        # Once a stream is drained the client has seen everything up to `until`
+        has_more = False
+        if len(db_tasks) == limit:
+            has_more = True
+            next_updated = (db_tasks[-1].updated_at, db_tasks[-1].id)
+        else:
+            next_updated = (until, None)
+        if len(tombstones) == limit:
+            has_more = True
+            next_deleted = (tombstones[-1].deleted_at, tombstones[-1].id)
+        else:
+            next_deleted = (until, None)
+
+        return TaskChanges(
+            updated=[TaskResponse.model_validate(task) for task in db_tasks],
+            deleted=[tombstone.id for tombstone in tombstones],
+            next_cursor=encode_sync_cursor(next_updated, next_deleted),
+            has_more=has_more,
+        )
+
+    async def purge_tombstones(self) -> int:
+        """Drop tombstones older than the retention window"""
+        older_than = datetime.now(timezone.utc) - timedelta(days=settings.tombstone_retention_days)
+        return await self.task_repository.purge_tombstones(older_than)
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        # SQLite hands back naive UTC timestamps
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+    async def get_task_etag(self, task_id: UUID) -> Optional[str]:
+        """ETag for a single task, or None if it doesn't exist"""
+        updated_at = await self.task_repository.get_task_version(task_id)
+        if updated_at is None:
+            return None
+        return self.task_etag(task_id, updated_at)
+
+    @staticmethod
+    def task_etag(task_id: UUID, updated_at: datetime) -> str:
+        return make_etag("task", str(task_id), updated_at)
+
     async def update_task(self, task_id: UUID, task_update: TaskUpdate) -> Optional[TaskResponse]:
         """Update a task"""
         db_task = await self.task_repository.update_task(task_id, task_update)
@@ -32,6 +210,149 @@ class TaskService:
             return TaskResponse.model_validate(db_task)
         return None
 
+    async def toggle_task(self, task_id: UUID) -> Optional[TaskResponse]:
+        """Toggle a task's completion status"""
+        db_task = await self.task_repository.toggle_task(task_id)
+        if db_task:
+            return TaskResponse.model_validate(db_task)
+        return None
+
     async def delete_task(self, task_id: UUID) -> bool:
         """Delete a task"""
-        return await self.task_repository.delete_task(task_id)
\ No newline at end of file
+        return await self.task_repository.delete_task(task_id)
+
+    async def import_tasks(self, data: AsyncIterable[bytes], import_format: ExportFormat) -> TaskImportResult:
+        """
+        Validate and insert tasks from an NDJSON or CSV byte stream.
+
+        Records are validated and written IMPORT_CHUNK_SIZE at a time, each chunk
+        in its own transaction. Invalid rows are reported by line number and
+        skipped; a chunk the database rejects is reported and the import moves on.
+        """
+        result = TaskImportResult(imported=0, failed=0, errors=[])
+        header: Optional[List[str]] = None
+        chunk: List[dict] = []
+        chunk_start = 0
+
+        def fail(line: int, error: str, count: int = 1):
+            result.failed += count
+            if len(result.errors) < MAX_REPORTED_IMPORT_ERRORS:
+                result.errors.append(TaskImportError(line=line, error=error))
+
+        async def flush():
+            if not chunk:
+                return
+            try:
+                result.imported += await self.task_repository.insert_task_rows(chunk)
+            except Exception as e:
+                await self.task_repository.db_session.rollback()
+                fail(chunk_start, f"{len(chunk)} rows starting here were not written: {e}", len(chunk))
+            chunk.clear()
+
+        async for line, record in self._import_records(data, import_format == ExportFormat.csv):
+            try:
+                if import_format == ExportFormat.csv:
+                    values = next(csv.reader([record.decode()]))
+                    if header is None:
+                        header = values
+                        continue
+                    # Blank cells fall back to the field defaults
+                    task = TaskCreate.model_validate(
+                        {name: value for name, value in zip(header, values) if value != ""}
+                    )
+                else:
+                    task = TaskCreate.model_validate_json(record)
+            except ValidationError as e:
+                fail(line, "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in e.errors()
+                ))
+                continue
+            except ValueError as e:
+                fail(line, str(e))
+                continue
+            if not chunk:
+                chunk_start = line
+            chunk.append(task.model_dump())
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                await flush()
+        await flush()
+        return result
+
+    @staticmethod
+    async def _import_records(data: AsyncIterable[bytes], quoted_newlines: bool) -> AsyncIterator[Tuple[int, bytes]]:
+        """Split a byte stream into (starting line number, record) pairs, skipping blank lines"""
+        pending = b""
+        record: List[bytes] = []
+        quotes = 0
+        line_number = 0
+
+        def complete(line: bytes) -> bool:
+            nonlocal quotes
+            record.append(line)
+            # A CSV record continues onto the next line while a quoted field is open
+            quotes += line.count(b'"') if quoted_newlines else 0
+            return quotes % 2 == 0
+
+        async for piece in data:
+            pending += piece
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                line_number += 1
+                if not complete(line):
+                    continue
+                joined = b"\n".join(record).rstrip(b"\r")
+                if joined.strip():
+                    yield line_number - len(record) + 1, joined
+                record, quotes = [], 0
+        if pending:
+            line_number += 1
+            complete(pending)
+        joined = b"\n".join(record).rstrip(b"\r")
+        if joined.strip():
+            yield line_number - len(record) + 1, joined
+
+    async def execute_batch(self, batch: TaskBatchRequest) -> TaskBatchResponse:
+        """Run a batch of task operations in one transaction and report a result per operation"""
+        operations = batch.operations
+        creates = [op.task for op in operations if op.op == "create"]
+        updates = [(op.id, op.task) for op in operations if op.op == "update"]
+        toggle_ids = [op.id for op in operations if op.op == "toggle"]
+        delete_ids = [op.id for op in operations if op.op == "delete"]
+
+        created, updated_ids, toggled_ids, deleted_ids, final = await self.task_repository.apply_batch(
+            creates, updates, toggle_ids, delete_ids
+        )
+
+        created_iter = iter(created)
+        results = []
+        for index, op in enumerate(operations):
+            if op.op == "create":
+                task = TaskResponse.model_validate(next(created_iter))
+                results.append(TaskBatchResult(index=index, op=op.op, success=True, task=task))
+                continue
+
+            found = op.id in {"update": updated_ids, "toggle": toggled_ids, "delete": deleted_ids}[op.op]
+            if not found:
+                results.append(TaskBatchResult(
+                    index=index, op=op.op, success=False, error=f"Task with id {op.id} not found"
+                ))
+                continue
+
+            task = final.get(op.id)
+            results.append(TaskBatchResult(
+                index=index,
+                op=op.op,
+                success=True,
+                task=TaskResponse.model_validate(task) if task is not None else None,
+            ))
+        return TaskBatchResponse(results=results)
+
+    async def update_tasks_where(self, query: TaskQuery, values: TaskBulkUpdate) -> TaskBulkResult:
+        """Update every task matching the query's filters"""
+        affected = await self.task_repository.update_tasks_where(query, values)
+        return TaskBulkResult(affected=affected)
+
+    async def delete_tasks_where(self, query: TaskQuery) -> TaskBulkResult:
+        """Delete every task matching the query's filters"""
+        affected = await self.task_repository.delete_tasks_where(query)
+        return TaskBulkResult(affected=affected)
@@ -1,12 +1,19 @@
 from typing import Optional
+import logging
+from app.db.database import AsyncSessionLocal
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate, UserUpdate, UserLogin
 from app.models.user import User
 
 
+logger = logging.getLogger(__name__)
+
+
 class UserService:
-    def __init__(self, user_repo: UserRepository):
+    def __init__(self, user_repo: UserRepository, primary_session_factory=AsyncSessionLocal):
         self.user_repo = user_repo
+        # user_repo may be on a read replica; rehashes are written through the primary
+        self.primary_session_factory = primary_session_factory
 
     async def create_user(self, user_data: UserCreate) -> Optional[User]:
         """Create a new user"""
@@ -29,5 +36,14 @@ class UserService:
         return await self.user_repo.delete_user(user_id)
 
     async def authenticate_user(self, email: str, password: str) -> Optional[User]:
-        """Authenticate a user by email and password"""
-        return await self.user_repo.authenticate_user(email, password)
\ No newline at end of file
+        """Authenticate a user by email and password, upgrading an outdated password hash"""
+        user, new_hash = await self.user_repo.authenticate_user(email, password)
+        if user is not None and new_hash is not None:
+            try:
+                async with self.primary_session_factory() as session:
+                    await UserRepository(session).update_password_hash(user.id, user.password_hash, new_hash)
+                user.password_hash = new_hash
+            except Exception as e:
+                # The old hash still verifies; the upgrade is retried on the next login
+                logger.error(f"Failed to rehash password for user {user.id}: {e}")
+        return user
\ No newline at end of file
@@ -9,4 +9,31 @@ class TaskValidationException(Exception):
     """Raised when task validation fails"""
     def __init__(self, message):
         self.message = message
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+class InvalidCursorException(Exception):
+    """Raised when a pagination cursor cannot be decoded"""
+    def __init__(self, cursor):
+        self.cursor = cursor
+        super().__init__(f"Invalid pagination cursor: {cursor}")
+
+
+class SyncCursorExpiredException(Exception):
+    """Raised when a delta-sync cursor is older than the tombstone retention window"""
+    def __init__(self, cursor):
+        self.cursor = cursor
+        super().__init__("Sync cursor has expired; fetch the full task list and start a new sync")
+
+
+class InvalidTokenException(Exception):
+    """Raised when an auth token is malformed, forged, expired, revoked or of the wrong type"""
+    def __init__(self, reason):
+        self.reason = reason
+        super().__init__(f"Invalid token: {reason}")
+
+
+class UserAlreadyExistsException(Exception):
+    """Raised when a signup clashes with an existing user's email or username"""
+    def __init__(self, field):
+        self.field = field
+        super().__init__(f"A user with this {field} already exists")
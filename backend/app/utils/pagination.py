@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from uuid import UUID
+
+from app.utils.exceptions import InvalidCursorException
+
+
+def encode_cursor(sort_by: str, sort_value: Any, task_id: UUID) -> str:
+    """Encode the (sort value, id) position of a task into an opaque cursor"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_by, sort_value, str(task_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, UUID]:
+    """Decode an opaque cursor back into its (sort value, id) position"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, sort_value, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort_by != sort_by:
+            raise ValueError("cursor was issued for a different sort order")
+        if sort_by == "created_at":
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, UUID(task_id)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursorException(cursor)
+
+
+def encode_sync_cursor(
+    updated_after: Tuple[datetime, Optional[UUID]], deleted_after: Tuple[datetime, Optional[UUID]]
+) -> str:
+    """Encode the positions reached in the task and tombstone streams into an opaque cursor"""
+    positions = [
+        [timestamp.isoformat(), str(row_id) if row_id else None]
+        for timestamp, row_id in (updated_after, deleted_after)
+    ]
+    raw = json.dumps(positions, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_cursor(cursor: str) -> Tuple[Tuple[datetime, Optional[UUID]], Tuple[datetime, Optional[UUID]]]:
+    """Decode a delta-sync cursor back into its task and tombstone positions"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (updated_at, updated_id), (deleted_at, deleted_id) = json.loads(base64.urlsafe_b64decode(padded))
+        return (
+            (datetime.fromisoformat(updated_at), UUID(updated_id) if updated_id else None),
+            (datetime.fromisoformat(deleted_at), UUID(deleted_id) if deleted_id else None),
+        )
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursorException(cursor)
@@ -0,0 +1,15 @@
+from typing import Any
+
+import orjson
+
+# Pydantic renders UTC datetimes with a "Z" suffix; match it so both paths emit identical JSON
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dump_json(value: Any) -> bytes:
+    """Serialize plain dicts/lists (UUIDs and datetimes included) straight to JSON bytes"""
+    return orjson.dumps(value, option=_ORJSON_OPTIONS)
+
+
+def load_json(data: bytes) -> Any:
+    return orjson.loads(data)
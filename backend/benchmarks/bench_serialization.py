@@ -0,0 +1,112 @@
+"""
+Time serializing tasks to the GET /api/v1/tasks JSON body, the old way (ORM
+objects through TaskResponse) against the new one (column rows through orjson),
+at 100, 10,000 and 100,000 tasks.
+
+Fetch and serialize are timed separately; peak memory for the whole path is
+recorded with tracemalloc on a separate run, so tracing doesn't skew the
+timings. Both paths are checked to produce identical bytes:
+
+    python -m benchmarks.bench_serialization
+
+BENCH_SERIALIZATION_SIZES overrides the sizes, e.g. "100,1000".
+"""
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="todo-bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["CACHE_BACKEND"] = "none"
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert
+
+from app.db.database import AsyncSessionLocal, Base, engine
+from app.models.task import Task
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskResponse
+from app.utils.serialization import dump_json
+
+SIZES = [int(size) for size in os.environ.get("BENCH_SERIALIZATION_SIZES", "100,10000,100000").split(",")]
+REPEATS = 5
+
+task_list = TypeAdapter(list[TaskResponse])
+
+
+async def seed(tasks: int):
+    started = datetime(2026, 1, 1)
+    async with engine.begin() as conn:
+        await conn.execute(delete(Task.__table__))
+        await conn.execute(insert(Task.__table__), [
+            {
+                "id": uuid4(), "title": f"Task {i}", "description": "", "completed": i % 3 == 0,
+                "priority": "medium", "created_at": started + timedelta(minutes=i),
+            }
+            for i in range(tasks)
+        ])
+
+
+async def fetch_objects():
+    async with AsyncSessionLocal() as session:
+        return await TaskRepository(session).get_all_tasks()
+
+
+async def fetch_rows():
+    async with AsyncSessionLocal() as session:
+        return await TaskRepository(session).get_all_task_rows()
+
+
+def serialize_objects(db_tasks) -> bytes:
+    return task_list.dump_json([TaskResponse.model_validate(task) for task in db_tasks])
+
+
+async def run_path(fetch, serialize):
+    """Fetch and serialize once; returns (fetch ms, serialize ms, body)"""
+    started = time.perf_counter()
+    fetched = await fetch()
+    fetched_at = time.perf_counter()
+    body = serialize(fetched)
+    return (fetched_at - started) * 1000, (time.perf_counter() - fetched_at) * 1000, body
+
+
+async def measure(label, fetch, serialize):
+    fetch_ms = serialize_ms = 0.0
+    for _ in range(REPEATS):
+        fetch_time, serialize_time, body = await run_path(fetch, serialize)
+        fetch_ms += fetch_time / REPEATS
+        serialize_ms += serialize_time / REPEATS
+
+    tracemalloc.start()
+    await run_path(fetch, serialize)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{label:>18}: fetch {fetch_ms:9.2f} ms  serialize {serialize_ms:8.2f} ms  "
+        f"total {fetch_ms + serialize_ms:9.2f} ms  peak {peak / 1024 / 1024:7.1f} MB"
+    )
+    return body
+
+
+async def main():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    print(f"mean of {REPEATS} runs; peak memory from one traced run")
+
+    for tasks in SIZES:
+        await seed(tasks)
+        print(f"{tasks} tasks")
+        pydantic_body = await measure("ORM + TaskResponse", fetch_objects, serialize_objects)
+        orjson_body = await measure("rows + orjson", fetch_rows, dump_json)
+        assert pydantic_body == orjson_body, "serializers disagree"
+        print(f"{'identical output':>18}: {len(orjson_body)} bytes")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
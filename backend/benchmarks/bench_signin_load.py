@@ -0,0 +1,102 @@
+"""
+Measure GET /api/v1/tasks/{id} latency while POST /auth/signin is hammered,
+with argon2 running in the hashing pool against running inline on the event loop.
+
+A probe requests one task every 20 ms while SIGNIN_LOOPS clients sign in
+back to back; the login throttle is raised out of the way. Runs against a
+throwaway SQLite file with the task cache disabled:
+
+    python -m benchmarks.bench_signin_load
+
+BENCH_SIGNIN_SECONDS sets how long each phase runs (default 5).
+"""
+import asyncio
+import math
+import os
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="todo-bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["CACHE_BACKEND"] = "none"
+for name in ("LOGIN_IP_BURST", "LOGIN_IP_PER_MINUTE", "LOGIN_EMAIL_BURST", "LOGIN_EMAIL_PER_MINUTE"):
+    os.environ[name] = "1000000"
+
+import httpx
+
+import app.repositories.user_repository as user_repository
+from app.core.security import pwd_context
+from app.core.settings import settings
+from app.db.database import Base, engine
+from app.main import app
+
+SECONDS = float(os.environ.get("BENCH_SIGNIN_SECONDS", 5))
+SIGNIN_LOOPS = 8
+PROBE_INTERVAL = 0.02
+CREDENTIALS = {"email": "bench@example.com", "password": "correct horse battery"}
+
+
+async def verify_inline(password, password_hash):
+    """What signin did before hashing moved to the pool: argon2 on the event loop"""
+    return pwd_context.verify_and_update(password, password_hash)
+
+
+async def probe(client, task_id, stop):
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(f"/api/v1/tasks/{task_id}")
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+        await asyncio.sleep(PROBE_INTERVAL)
+    return latencies
+
+
+async def sign_in(client, stop):
+    signins = 0
+    while not stop.is_set():
+        response = await client.post("/auth/signin", json=CREDENTIALS)
+        assert response.status_code == 200, response.text
+        signins += 1
+    return signins
+
+
+async def phase(label, client, task_id, loops):
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, task_id, stop))
+    signin_tasks = [asyncio.create_task(sign_in(client, stop)) for _ in range(loops)]
+    await asyncio.sleep(SECONDS)
+    stop.set()
+    latencies = sorted(await probe_task)
+    signins = sum(await asyncio.gather(*signin_tasks))
+
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[math.ceil(len(latencies) * 0.99) - 1]
+    print(f"{label:>22}: p50 {p50:8.2f} ms  p99 {p99:8.2f} ms  ({len(latencies)} probes, {signins / SECONDS:5.1f} signins/s)")
+
+
+async def main():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        signup = await client.post("/auth/signup", json=dict(CREDENTIALS, username="bench"))
+        assert signup.status_code == 201, signup.text
+        task_id = (await client.post("/api/v1/tasks", json={"title": "probe"})).json()["id"]
+
+        print(
+            f"{SIGNIN_LOOPS} signin loops, {settings.password_hash_workers} {settings.password_hash_executor} "
+            f"workers, probe every {PROBE_INTERVAL * 1000:.0f} ms for {SECONDS:.0f}s"
+        )
+        await phase("no signins", client, task_id, 0)
+        await phase("signins, hashing pool", client, task_id, SIGNIN_LOOPS)
+        original = user_repository.verify_password
+        user_repository.verify_password = verify_inline
+        try:
+            await phase("signins, inline argon2", client, task_id, SIGNIN_LOOPS)
+        finally:
+            user_repository.verify_password = original
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+Time GET /api/v1/tasks pages over 10,000 tasks, with and without If-None-Match.
+
+Runs against a throwaway SQLite file with the task cache disabled, so every
+request reaches the database:
+
+    python -m benchmarks.bench_task_list_etag
+"""
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="todo-bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["CACHE_BACKEND"] = os.environ.get("BENCH_CACHE_BACKEND", "none")
+
+import httpx
+from sqlalchemy import insert
+
+from app.db.database import Base, engine
+from app.main import app
+from app.models.task import Task
+
+TASKS = 10_000
+PAGE_SIZE = 50
+REPEATS = 50
+
+
+async def seed():
+    # One task a minute, so the keyset seek isn't reduced to breaking ties on id
+    started = datetime(2026, 1, 1)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Task.__table__), [
+            {
+                "id": uuid4(), "title": f"Task {i}", "description": "", "completed": i % 3 == 0,
+                "priority": "medium", "created_at": started + timedelta(minutes=i),
+            }
+            for i in range(TASKS)
+        ])
+
+
+async def timed(client, params, headers=None):
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        response = await client.get("/api/v1/tasks", params=params, headers=headers or {})
+    return (time.perf_counter() - started) / REPEATS * 1000, response
+
+
+async def main():
+    await seed()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        # Walk to page 100 to get a deep cursor
+        params = {"limit": PAGE_SIZE}
+        cursor = None
+        for _ in range(100):
+            page = (await client.get("/api/v1/tasks", params=dict(params, **({"cursor": cursor} if cursor else {})))).json()
+            cursor = page["next_cursor"]
+
+        for label, page_params in (("page 1", params), ("page 100", dict(params, cursor=cursor))):
+            ms, response = await timed(client, page_params)
+            conditional_ms, conditional = await timed(client, page_params, {"If-None-Match": response.headers["ETag"]})
+            print(f"{label:>9}: {ms:6.2f} ms   If-None-Match: {conditional_ms:6.2f} ms ({conditional.status_code})")
+
+        ms, response = await timed(client, {})
+        conditional_ms, conditional = await timed(client, {}, {"If-None-Match": response.headers["ETag"]})
+        print(f"full list: {ms:6.2f} ms   If-None-Match: {conditional_ms:6.2f} ms ({conditional.status_code})")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Time issuing and verifying signed access tokens, alone and through GET /auth/me,
+and check that verification never reaches the database.
+
+verify_token is timed against an empty revocation set and against one holding
+100,000 revoked ids, since the lookup should stay a single probe:
+
+    python -m benchmarks.bench_tokens
+"""
+import asyncio
+import os
+import tempfile
+import time
+from uuid import uuid4
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="todo-bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["CACHE_BACKEND"] = "none"
+os.environ.setdefault("AUTH_SECRET_KEY", "bench-secret")
+
+import httpx
+from sqlalchemy import event
+
+from app.auth import ACCESS_TOKEN, token_revocations, token_signer
+from app.auth.dependencies import verify_token
+from app.db.database import engine
+from app.main import app
+
+ITERATIONS = 20_000
+REQUESTS = 1_000
+REVOKED = 100_000
+
+
+def timed(label, fn, iterations=ITERATIONS):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    print(f"{label:>34}: {(time.perf_counter() - started) / iterations * 1e6:8.1f} us")
+
+
+async def timed_async(label, fn, iterations=ITERATIONS):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    print(f"{label:>34}: {(time.perf_counter() - started) / iterations * 1e6:8.1f} us")
+
+
+async def main():
+    user_id = uuid4()
+    token = token_signer.issue_pair(user_id, "bench@example.com", "bench").access_token
+    print(f"mean of {ITERATIONS} calls, {REQUESTS} requests for GET /auth/me")
+
+    timed("issue_pair", lambda: token_signer.issue_pair(user_id, "bench@example.com", "bench"))
+    timed("decode", lambda: token_signer.decode(token, ACCESS_TOKEN))
+    await timed_async("verify_token, nothing revoked", lambda: verify_token(token, ACCESS_TOKEN))
+    far_future = time.time() + 3600
+    for _ in range(REVOKED):
+        await token_revocations.revoke(uuid4().hex, far_future)
+    await timed_async(f"verify_token, {REVOKED} revoked", lambda: verify_token(token, ACCESS_TOKEN))
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        assert (await client.get("/auth/me", headers=headers)).status_code == 200
+        await timed_async("GET /auth/me", lambda: client.get("/auth/me", headers=headers), REQUESTS)
+    print(f"{'database statements':>34}: {len(statements)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
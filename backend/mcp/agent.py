@@ -1,164 +1,406 @@
 import re
+import time
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+from pydantic import ValidationError
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskCreateOperation, TaskUpdateOperation, TaskToggleOperation, TaskDeleteOperation
+)
 from .gemini_client import get_gemini_client
+from .intents import parse_intent, intent_stats
+from .planner import plan_waves, referenced_title
+from .response_cache import chat_response_cache
 
-async def get_gemini_response(prompt: str) -> str:
+# Task titles sent to Gemini as context; bounded so prompts don't grow with the task list
+CONTEXT_TASK_LIMIT = 50
+
+ACTION_PREFIX = "ACTION:"
+# Free-form answers arrive in this shape; their text is streamed as it is generated
+GENERAL_PREFIX = "ACTION:general|RESPONSE:"
+
+async def get_gemini_response(prompt: str, client=None) -> str:
     """
     Get a response from the actual Gemini API based on the provided prompt.
     The function will use tools as needed to interact with the todo app.
 
+    Commands that match one of the documented shapes exactly are parsed and
+    executed locally; only the rest are sent to Gemini.
+
     Args:
         prompt: The user's input/prompt
+        client: Model client to use instead of Gemini (e.g. a local stub)
 
     Returns:
         The response as a string
     """
+    started = time.perf_counter()
     try:
-        # Get the current tasks to provide context to Gemini
-        from .tools.read_tasks import read_tasks
-        tasks_result = await read_tasks()
-        context = None
-        if tasks_result["success"]:
-            context = {
-                "available_tasks": [task["title"] for task in tasks_result["tasks"]],
-                "total_tasks": len(tasks_result["tasks"])
-            }
+        local_action = parse_intent(prompt)
+        if local_action is not None:
+            response = await execute_action(local_action, prompt)
+            intent_stats.record("local", time.perf_counter() - started)
+            return response
+
+        context = await build_context()
 
-        # Get response from the actual Gemini API
-        gemini_client = get_gemini_client()
-        gemini_response = await gemini_client.generate_response(prompt, context)
+        # Get response from the actual Gemini API, unless the same prompt was
+        # answered for the same task context recently
+        gemini_client = client or get_gemini_client()
+        gemini_response = await chat_response_cache.generate(gemini_client, prompt, context)
 
         # Parse the response to determine if it's a command or general response
         if gemini_response.startswith("ACTION:"):
-            # Parse the action from Gemini's response
-            parts = gemini_response.split("|")
-            action_dict = {}
-            for part in parts:
-                if ":" in part:
-                    key, value = part.split(":", 1)
-                    action_dict[key] = value
-
-            action = action_dict.get("ACTION")
-
-            if action == "add_task":
-                title = action_dict.get("TITLE", "").strip('"\'')
-                from .tools.add_task import add_task
-                result = await add_task(title=title)
-                if result["success"]:
-                    return f"Okay, I've added \"{title}\" to your task list."
-                else:
-                    return f"Sorry, I couldn't add the task: {result['error']}"
-
-            elif action == "update_task":
-                old_title = action_dict.get("OLD_TITLE", "").strip('"\'')
-                new_title = action_dict.get("NEW_TITLE", "").strip('"\'')
-
-                # Find the task by title first
-                from .tools.read_tasks import read_tasks
-                read_result = await read_tasks()
-
-                if read_result["success"]:
-                    target_task = None
-                    for task in read_result["tasks"]:
-                        if task["title"].lower() == old_title.lower():
-                            target_task = task
-                            break
-
-                    if target_task:
-                        from .tools.update_task import update_task
-                        update_result = await update_task(
-                            task_id=target_task["id"],
-                            title=new_title
-                        )
-
-                        if update_result["success"]:
-                            return f"Okay, I've updated the task from '{old_title}' to '{new_title}'."
-                        else:
-                            return f"Sorry, I couldn't update the task: {update_result['error']}"
-                    else:
-                        return f"I couldn't find a task with the title '{old_title}'."
+            response = await execute_reply(gemini_response)
+        else:
+            # If Gemini didn't return an ACTION format, return its response directly
+            response = gemini_response
+        intent_stats.record("gemini", time.perf_counter() - started)
+        return response
+
+    except Exception as e:
+        return f"Error processing request: {str(e)}"
+
+
+async def stream_gemini_response(prompt: str, client=None) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Streaming variant of get_gemini_response, yielding (event, text) pairs.
+
+    "token" events carry pieces of a free-text answer as Gemini generates them.
+    A command is buffered until the reply is complete, executed, and its outcome
+    sent as one "message" event.
+
+    Args:
+        prompt: The user's input/prompt
+        client: Model client to use instead of Gemini (e.g. a local stub)
+    """
+    started = time.perf_counter()
+    try:
+        local_action = parse_intent(prompt)
+        if local_action is not None:
+            yield "message", await execute_action(local_action, prompt)
+            intent_stats.record("local", time.perf_counter() - started)
+            return
+
+        context = await build_context()
+        cached = await chat_response_cache.lookup(prompt, context)
+        if cached is not None:
+            yield "message", await execute_reply(cached)
+            intent_stats.record("gemini", time.perf_counter() - started)
+            return
+
+        gemini_client = client or get_gemini_client()
+        reply = ""
+        mode = None  # "text" streams as-is, "general" streams after the prefix, "action" buffers
+        async for piece in gemini_client.stream_response(prompt, context):
+            reply += piece
+            if mode is None:
+                if GENERAL_PREFIX.startswith(reply):
+                    # Too little has arrived to tell what kind of reply this is
+                    continue
+                if reply.startswith(GENERAL_PREFIX):
+                    mode = "general"
+                    piece = reply[len(GENERAL_PREFIX):]
+                elif reply.startswith(ACTION_PREFIX):
+                    mode = "action"
                 else:
-                    return f"Sorry, I couldn't retrieve your tasks to find the one to update: {read_result['error']}"
-
-            elif action == "delete_task":
-                title = action_dict.get("TITLE", "").strip('"\'')
-
-                # Find the task by title first
-                from .tools.read_tasks import read_tasks
-                read_result = await read_tasks()
-
-                if read_result["success"]:
-                    target_task = None
-                    for task in read_result["tasks"]:
-                        if task["title"].lower() == title.lower():
-                            target_task = task
-                            break
-
-                    if target_task:
-                        from .tools.delete_task import delete_task
-                        delete_result = await delete_task(task_id=target_task["id"])
-
-                        if delete_result["success"]:
-                            return f"Okay, I've deleted the task '{title}'."
-                        else:
-                            return f"Sorry, I couldn't delete the task: {delete_result['error']}"
-                    else:
-                        return f"I couldn't find a task with the title '{title}'."
+                    mode = "text"
+                    piece = reply
+            if mode != "action" and piece:
+                yield "token", piece
+
+        if mode == "action" or (mode is None and reply.startswith(ACTION_PREFIX)):
+            yield "message", await execute_reply(reply)
+        elif mode is None and reply:
+            yield "token", reply
+        await chat_response_cache.store(prompt, context, reply, time.perf_counter() - started)
+        intent_stats.record("gemini", time.perf_counter() - started)
+
+    except Exception as e:
+        yield "error", f"Error processing request: {str(e)}"
+
+
+async def build_context() -> Dict[str, Any]:
+    """The most recent task titles, given to Gemini as context"""
+    from .tools.read_tasks import read_recent_tasks
+    recent_result = await read_recent_tasks(CONTEXT_TASK_LIMIT)
+    context = None
+    if recent_result["success"]:
+        context = {
+            "available_tasks": [task["title"] for task in recent_result["tasks"]],
+            "more_tasks_not_listed": recent_result["has_more"]
+        }
+    return context
+
+
+def parse_action(gemini_response: str) -> Dict[str, str]:
+    """Split an "ACTION:...|KEY:value" response into a dict"""
+    parts = gemini_response.split("|")
+    action_dict = {}
+    for part in parts:
+        if ":" in part:
+            key, value = part.split(":", 1)
+            action_dict[key] = value
+    return action_dict
+
+
+def parse_actions(gemini_response: str) -> List[Dict[str, str]]:
+    """Split a response holding one "ACTION:" line per operation into action dicts"""
+    blocks: List[str] = []
+    for line in gemini_response.splitlines():
+        if line.lstrip().startswith(ACTION_PREFIX) or not blocks:
+            blocks.append(line.strip())
+        else:
+            # A multi-line RESPONSE continues the previous action
+            blocks[-1] += "\n" + line
+    return [parse_action(block) for block in blocks if block]
+
+
+async def execute_reply(gemini_response: str) -> str:
+    """Run the action, or actions, in an "ACTION:" response and describe the outcome"""
+    actions = parse_actions(gemini_response)
+    if len(actions) > 1:
+        return await execute_actions(actions)
+    return await execute_action(parse_action(gemini_response), gemini_response)
+
+
+async def execute_actions(actions: List[Dict[str, str]]) -> str:
+    """
+    Run several actions from one response in one transaction and summarise each outcome.
+
+    Writes are grouped into waves by plan_waves; each wave resolves its titles in
+    one query and applies its changes as one set-based batch. An action that
+    can't be applied, such as one naming a missing task, is reported and the
+    rest still go ahead. If the database rejects a batch, nothing is saved.
+    Lists and general replies run after the writes, so they see them.
+
+    Args:
+        actions: The parsed actions, in the order the user asked for them
+
+    Returns:
+        One line per action, in the same order
+    """
+    from .tools.context import tool_context
+    outcomes: List[Optional[str]] = [None] * len(actions)
+    async with tool_context() as ctx:
+        for wave in plan_waves(actions):
+            error = await _run_wave(actions, wave, outcomes, ctx)
+            if error is not None:
+                await ctx.rollback()
+                return f"Sorry, I couldn't save those changes, so none of them were made: {error}"
+
+        for index, action in enumerate(actions):
+            if outcomes[index] is None:
+                unknown = f"I didn't understand the request '{action.get('ACTION')}'."
+                outcomes[index] = await _run_action(action, unknown, ctx)
+
+    # Indent multi-line outcomes, such as a task list, under their bullet
+    return "Here's what I did:\n" + "\n".join("- " + outcome.replace("\n", "\n  ") for outcome in outcomes)
+
+
+async def _run_wave(
+    actions: List[Dict[str, str]], wave: List[int], outcomes: List[Optional[str]], ctx
+) -> Optional[str]:
+    """Apply one wave of write actions as a batch and fill in their outcomes; returns a database error, if any"""
+    from .tools.batch_tasks import find_tasks_by_titles, apply_task_batch
+
+    found: Dict[str, Dict[str, Any]] = {}
+    titles = [title for title in (referenced_title(actions[index]) for index in wave) if title is not None]
+    if titles:
+        find_result = await find_tasks_by_titles(titles, ctx=ctx)
+        if not find_result["success"]:
+            return find_result["error"]
+        found = find_result["tasks"]
+
+    operations = []
+    planned: List[int] = []
+    for index in wave:
+        action = actions[index]
+        name = action["ACTION"]
+        title = referenced_title(action) or action.get("TITLE", "").strip('"\'')
+        try:
+            if name == "add_task":
+                operations.append(TaskCreateOperation(op="create", task=TaskCreate(title=title)))
+            else:
+                target_task = found.get(title)
+                if target_task is None:
+                    outcomes[index] = f"I couldn't find a task with the title '{title}'."
+                    continue
+                if name == "update_task":
+                    new_title = action.get("NEW_TITLE", "").strip('"\'')
+                    operations.append(TaskUpdateOperation(
+                        op="update", id=target_task["id"], task=TaskUpdate(title=new_title)
+                    ))
+                elif name == "delete_task":
+                    operations.append(TaskDeleteOperation(op="delete", id=target_task["id"]))
                 else:
-                    return f"Sorry, I couldn't retrieve your tasks to find the one to delete: {read_result['error']}"
-
-            elif action == "complete_task":
-                title = action_dict.get("TITLE", "").strip('"\'')
-
-                # Find the task by title first
-                from .tools.read_tasks import read_tasks
-                read_result = await read_tasks()
-
-                if read_result["success"]:
-                    target_task = None
-                    for task in read_result["tasks"]:
-                        if task["title"].lower() == title.lower():
-                            target_task = task
-                            break
-
-                    if target_task:
-                        from .tools.complete_task import complete_task
-                        complete_result = await complete_task(task_id=target_task["id"])
-
-                        if complete_result["success"]:
-                            task_title = complete_result["task"]["title"]
-                            new_status = "completed" if complete_result["task"]["completed"] else "marked as incomplete"
-                            return f"Okay, I've {new_status} the task '{task_title}'."
-                        else:
-                            return f"Sorry, I couldn't update the task completion status: {complete_result['error']}"
-                    else:
-                        return f"I couldn't find a task with the title '{title}'."
+                    operations.append(TaskToggleOperation(op="toggle", id=target_task["id"]))
+        except ValidationError as e:
+            outcomes[index] = f"Sorry, I couldn't {_ACTION_VERBS[name]} '{title}': {e.errors()[0]['msg']}"
+            continue
+        planned.append(index)
+
+    if not operations:
+        return None
+    batch_result = await apply_task_batch(operations, ctx=ctx)
+    if not batch_result["success"]:
+        return batch_result["error"]
+    for index, result in zip(planned, batch_result["results"]):
+        outcomes[index] = _describe_outcome(actions[index], result)
+    return None
+
+
+_ACTION_VERBS = {
+    "add_task": "add",
+    "update_task": "update",
+    "delete_task": "delete",
+    "complete_task": "complete",
+}
+
+
+def _describe_outcome(action: Dict[str, str], result: Dict[str, Any]) -> str:
+    name = action["ACTION"]
+    title = referenced_title(action) or action.get("TITLE", "").strip('"\'')
+    if not result["success"]:
+        return f"Sorry, I couldn't {_ACTION_VERBS[name]} '{title}': {result['error']}"
+    if name == "add_task":
+        return f"Added \"{title}\"."
+    if name == "update_task":
+        new_title = action.get("NEW_TITLE", "").strip('"\'')
+        return f"Renamed '{title}' to '{new_title}'."
+    if name == "delete_task":
+        return f"Deleted '{title}'."
+    if result["task"]["completed"]:
+        return f"Completed '{title}'."
+    return f"Marked '{title}' as incomplete."
+
+
+async def execute_action(action_dict: Dict[str, str], raw_response: str) -> str:
+    """
+    Run a parsed action against the todo app and describe the outcome.
+
+    Every tool call for the action shares one session and transaction, which
+    is committed once the action has run.
+
+    Args:
+        action_dict: The action and its arguments, as produced by parse_action or parse_intent
+        raw_response: Returned as-is when the action is not recognised
+
+    Returns:
+        The response as a string
+    """
+    from .tools.context import tool_context
+    async with tool_context() as ctx:
+        return await _run_action(action_dict, raw_response, ctx)
+
+
+async def _run_action(action_dict: Dict[str, str], raw_response: str, ctx) -> str:
+    action = action_dict.get("ACTION")
+
+    if action == "add_task":
+        title = action_dict.get("TITLE", "").strip('"\'')
+        from .tools.add_task import add_task
+        result = await add_task(title=title, ctx=ctx)
+        if result["success"]:
+            return f"Okay, I've added \"{title}\" to your task list."
+        else:
+            return f"Sorry, I couldn't add the task: {result['error']}"
+
+    elif action == "update_task":
+        old_title = action_dict.get("OLD_TITLE", "").strip('"\'')
+        new_title = action_dict.get("NEW_TITLE", "").strip('"\'')
+
+        # Find the task by title through the lower(title) index
+        from .tools.read_tasks import find_task_by_title
+        read_result = await find_task_by_title(old_title, ctx=ctx)
+
+        if read_result["success"] or read_result.get("not_found"):
+            target_task = read_result.get("task")
+
+            if target_task:
+                from .tools.update_task import update_task
+                update_result = await update_task(
+                    task_id=target_task["id"],
+                    title=new_title,
+                    ctx=ctx
+                )
+
+                if update_result["success"]:
+                    return f"Okay, I've updated the task from '{old_title}' to '{new_title}'."
                 else:
-                    return f"Sorry, I couldn't retrieve your tasks to find the one to mark as completed: {read_result['error']}"
-
-            elif action == "list_tasks":
-                if tasks_result["success"]:
-                    if tasks_result["count"] == 0:
-                        return "You don't have any tasks right now."
-                    else:
-                        task_list = "\n".join([f"- {task['title']}" for task in tasks_result["tasks"]])
-                        return f"Here are your tasks:\n{task_list}"
+                    return f"Sorry, I couldn't update the task: {update_result['error']}"
+            else:
+                return f"I couldn't find a task with the title '{old_title}'."
+        else:
+            return f"Sorry, I couldn't retrieve your tasks to find the one to update: {read_result['error']}"
+
+    elif action == "delete_task":
+        title = action_dict.get("TITLE", "").strip('"\'')
+
+        # Find the task by title through the lower(title) index
+        from .tools.read_tasks import find_task_by_title
+        read_result = await find_task_by_title(title, ctx=ctx)
+
+        if read_result["success"] or read_result.get("not_found"):
+            target_task = read_result.get("task")
+
+            if target_task:
+                from .tools.delete_task import delete_task
+                delete_result = await delete_task(task_id=target_task["id"], ctx=ctx)
+
+                if delete_result["success"]:
+                    return f"Okay, I've deleted the task '{title}'."
                 else:
-                    return f"Sorry, I couldn't retrieve your tasks: {tasks_result['error']}"
+                    return f"Sorry, I couldn't delete the task: {delete_result['error']}"
+            else:
+                return f"I couldn't find a task with the title '{title}'."
+        else:
+            return f"Sorry, I couldn't retrieve your tasks to find the one to delete: {read_result['error']}"
+
+    elif action == "complete_task":
+        title = action_dict.get("TITLE", "").strip('"\'')
+
+        # Find the task by title through the lower(title) index
+        from .tools.read_tasks import find_task_by_title
+        read_result = await find_task_by_title(title, ctx=ctx)
 
-            elif action == "general":
-                return action_dict.get("RESPONSE", "I processed your request.")
+        if read_result["success"] or read_result.get("not_found"):
+            target_task = read_result.get("task")
 
+            if target_task:
+                from .tools.complete_task import complete_task
+                complete_result = await complete_task(task_id=target_task["id"], ctx=ctx)
+
+                if complete_result["success"]:
+                    task_title = complete_result["task"]["title"]
+                    new_status = "completed" if complete_result["task"]["completed"] else "marked as incomplete"
+                    return f"Okay, I've {new_status} the task '{task_title}'."
+                else:
+                    return f"Sorry, I couldn't update the task completion status: {complete_result['error']}"
             else:
-                # If Gemini returned an unrecognized action, return its response directly
-                return gemini_response
+                return f"I couldn't find a task with the title '{title}'."
         else:
-            # If Gemini didn't return an ACTION format, return its response directly
-            return gemini_response
+            return f"Sorry, I couldn't retrieve your tasks to find the one to mark as completed: {read_result['error']}"
+
+    elif action == "list_tasks":
+        # Only listing needs every task
+        from .tools.read_tasks import read_tasks
+        tasks_result = await read_tasks(ctx=ctx)
+        if tasks_result["success"]:
+            if tasks_result["count"] == 0:
+                return "You don't have any tasks right now."
+            else:
+                task_list = "\n".join([f"- {task['title']}" for task in tasks_result["tasks"]])
+                return f"Here are your tasks:\n{task_list}"
+        else:
+            return f"Sorry, I couldn't retrieve your tasks: {tasks_result['error']}"
+
+    elif action == "general":
+        return action_dict.get("RESPONSE", "I processed your request.")
+
+    else:
+        # If Gemini returned an unrecognized action, return its response directly
+        return raw_response
 
-    except Exception as e:
-        return f"Error processing request: {str(e)}"
 
 if __name__ == "__main__":
     # Example usage
@@ -1,7 +1,8 @@
 import os
-import google.generativeai as genai
+import asyncio
 from app.core.settings import settings
-from typing import Dict, Any, Optional
+from .resilience import GuardedModelClient, model_guard
+from typing import Dict, Any, AsyncIterator, Optional
 
 class GeminiClient:
     def __init__(self):
@@ -10,6 +11,12 @@ class GeminiClient:
         if not api_key:
             raise ValueError("GEMINI_API_KEY not found in settings")
 
+        # Imported here so CHAT_MODEL_BACKEND=stub runs without the Gemini SDK installed
+        try:
+            import google.generativeai as genai
+        except ImportError as e:
+            raise RuntimeError("CHAT_MODEL_BACKEND=gemini requires the 'google-generativeai' package") from e
+
         genai.configure(api_key=api_key)
         # Use gemini-2.5-flash which is available and supports generateContent
         self.model = genai.GenerativeModel('models/gemini-2.5-flash')
@@ -25,9 +32,34 @@ class GeminiClient:
         Returns:
             The response as a string
         """
-        try:
-            # Prepare the full prompt with context if available
-            full_prompt = f"""
+        # Errors propagate so the caller's retry and circuit-breaker policy sees them
+        response = await self.model.generate_content_async(self._build_prompt(prompt, context))
+
+        # Return the text response
+        return response.text if response.text else "I couldn't process that request."
+
+    async def stream_response(
+        self, prompt: str, context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a response using the Gemini streaming API, yielding text as it arrives
+
+        Args:
+            prompt: The user's input/prompt
+            context: Additional context about tasks, etc.
+
+        Yields:
+            Successive pieces of the response text
+        """
+        response = await self.model.generate_content_async(self._build_prompt(prompt, context), stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    @staticmethod
+    def _build_prompt(prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
+        # Prepare the full prompt with context if available
+        full_prompt = f"""
             You are an AI assistant for a todo application. The user can ask you to:
             - Add tasks: "Add task: [task title]"
             - Update tasks: "Update task '[old title]' to '[new title]'"
@@ -43,26 +75,55 @@ class GeminiClient:
             - For listing: "ACTION:list_tasks"
             - For general chat: "ACTION:general|RESPONSE:[your response]"
 
+            If the user asks for several of these operations in one message, reply
+            with one ACTION line per operation, in the order they were asked for.
+            Use "ACTION:general" only on its own.
+
             Current user input: {prompt}
             """
 
-            if context:
-                full_prompt += f"\n\nAdditional context: {context}"
+        if context:
+            full_prompt += f"\n\nAdditional context: {context}"
+        return full_prompt
+
+class StubGeminiClient:
+    """Local stand-in for GeminiClient that returns canned replies, for tests and benchmarks"""
+
+    def __init__(self, reply: str = "ACTION:general|RESPONSE:Hello!", delay: float = 0.0, chunk_size: int = 8):
+        self.reply = reply
+        self.delay = delay
+        self.chunk_size = chunk_size
+        self.calls = 0
+
+    async def generate_response(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.reply
 
-            # Generate content using the Gemini API
-            response = await self.model.generate_content_async(full_prompt)
+    async def stream_response(
+        self, prompt: str, context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        # Emit the canned reply a few characters at a time, spreading the delay across chunks
+        self.calls += 1
+        pieces = [self.reply[i:i + self.chunk_size] for i in range(0, len(self.reply), self.chunk_size)]
+        for piece in pieces:
+            if self.delay:
+                await asyncio.sleep(self.delay / len(pieces))
+            yield piece
 
-            # Return the text response
-            return response.text if response.text else "I couldn't process that request."
+def build_model_backend():
+    """Create the model client selected by CHAT_MODEL_BACKEND"""
+    if settings.chat_model_backend.lower() == "stub":
+        return StubGeminiClient(settings.chat_stub_reply, settings.chat_stub_delay)
+    return GeminiClient()
 
-        except Exception as e:
-            return f"Error communicating with Gemini API: {str(e)}"
 
 # Global instance
 gemini_client = None
 
-def get_gemini_client() -> GeminiClient:
+def get_gemini_client() -> GuardedModelClient:
     global gemini_client
     if gemini_client is None:
-        gemini_client = GeminiClient()
+        gemini_client = GuardedModelClient(build_model_backend(), model_guard)
     return gemini_client
\ No newline at end of file
@@ -0,0 +1,99 @@
+import re
+import threading
+from typing import Any, Dict, Optional
+
+# Command shapes documented in the Gemini prompt. A title is either quoted or
+# everything after a colon; anything looser is left to Gemini.
+_TITLE = r"""(?:\s*:\s*(?P<bare>.+?)|\s+(?P<q>['"])(?P<quoted>.+?)(?P=q))"""
+_POLITE = r"(?:please\s+)?"
+_END = r"[.!]?"
+
+_ADD = re.compile(rf"^{_POLITE}(?:add|create)\s+(?:a\s+)?(?:new\s+)?task{_TITLE}{_END}$", re.IGNORECASE)
+_DELETE = re.compile(rf"^{_POLITE}(?:delete|remove)\s+(?:the\s+)?task{_TITLE}{_END}$", re.IGNORECASE)
+_COMPLETE = re.compile(rf"^{_POLITE}(?:complete|finish)\s+(?:the\s+)?task{_TITLE}{_END}$", re.IGNORECASE)
+_UPDATE = re.compile(
+    rf"""^{_POLITE}(?:update|rename|change)\s+(?:the\s+)?task\s+(?P<q1>['"])(?P<old>.+?)(?P=q1)"""
+    rf"""\s+to\s+(?P<q2>['"])(?P<new>.+?)(?P=q2){_END}$""",
+    re.IGNORECASE,
+)
+# A conjunction or separator followed by another command inside a captured title
+# means the lazy match swallowed a second clause ("... 'a' and delete task 'b'",
+# "Add task: milk. Complete laundry")
+_NEXT_COMMAND = re.compile(
+    r"(?:\b(?:and|then|also)|[,;.])\s+(?:and\s+|then\s+|also\s+)?(?:please\s+)?"
+    r"(?:add|create|delete|remove|complete|finish|update|rename|change)\b",
+    re.IGNORECASE,
+)
+_LIST = re.compile(
+    r"^(?:please\s+)?(?:show|list|display|view)(?:\s+me)?(?:\s+all)?(?:\s+(?:of\s+)?my)?(?:\s+the)?\s+tasks[.!?]?$"
+    r"|^what\s+are\s+my\s+tasks\??$",
+    re.IGNORECASE,
+)
+
+
+def _title(match: re.Match) -> str:
+    return (match.group("quoted") or match.group("bare")).strip().strip('"\'').strip()
+
+
+def _is_compound(title: str, quote: Optional[str] = None) -> bool:
+    """Whether a captured title spans more than one command; `quote` is the title's delimiter"""
+    return bool((quote and quote in title) or _NEXT_COMMAND.search(title))
+
+
+def parse_intent(prompt: str) -> Optional[Dict[str, str]]:
+    """
+    Recognise an unambiguous todo command without calling Gemini.
+
+    Returns an action dict in the same shape as a parsed Gemini "ACTION:" reply,
+    or None when the message should go to Gemini.
+    """
+    text = " ".join(prompt.split())
+    if not text:
+        return None
+
+    if _LIST.match(text):
+        return {"ACTION": "list_tasks"}
+    match = _UPDATE.match(text)
+    if match:
+        if _is_compound(match.group("old"), match.group("q1")) or _is_compound(match.group("new"), match.group("q2")):
+            return None
+        return {"ACTION": "update_task", "OLD_TITLE": match.group("old"), "NEW_TITLE": match.group("new")}
+    for pattern, action in ((_ADD, "add_task"), (_DELETE, "delete_task"), (_COMPLETE, "complete_task")):
+        match = pattern.match(text)
+        if match:
+            title = _title(match)
+            if not title or _is_compound(title, match.group("q")):
+                return None
+            return {"ACTION": action, "TITLE": title}
+    return None
+
+
+class IntentStats:
+    """How many chat messages were answered locally versus by Gemini, and how fast"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._count = {"local": 0, "gemini": 0}
+        self._total_seconds = {"local": 0.0, "gemini": 0.0}
+
+    def record(self, path: str, seconds: float) -> None:
+        with self._lock:
+            self._count[path] += 1
+            self._total_seconds[path] += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self._count.values())
+            return {
+                "messages": total,
+                "local": self._count["local"],
+                "gemini": self._count["gemini"],
+                "local_fraction": round(self._count["local"] / total, 4) if total else 0.0,
+                **{
+                    f"avg_{path}_ms": round(self._total_seconds[path] / count * 1000, 3) if count else 0.0
+                    for path, count in self._count.items()
+                },
+            }
+
+
+intent_stats = IntentStats()
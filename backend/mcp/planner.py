@@ -0,0 +1,48 @@
+from typing import Dict, List, Optional
+
+# Actions that write tasks; these are grouped into set-based batches
+WRITE_ACTIONS = ("add_task", "update_task", "delete_task", "complete_task")
+
+
+def referenced_title(action: Dict[str, str]) -> Optional[str]:
+    """The existing task title a write action has to be resolved against, if any"""
+    name = action.get("ACTION")
+    if name == "update_task":
+        return action.get("OLD_TITLE", "").strip('"\'')
+    if name in ("delete_task", "complete_task"):
+        return action.get("TITLE", "").strip('"\'')
+    return None
+
+
+def touched_titles(action: Dict[str, str]) -> List[str]:
+    """Lower-cased titles a write action creates, renames or changes"""
+    titles = [action.get("TITLE", ""), action.get("OLD_TITLE", ""), action.get("NEW_TITLE", "")]
+    return [title.strip('"\'').lower() for title in titles if title]
+
+
+def plan_waves(actions: List[Dict[str, str]]) -> List[List[int]]:
+    """
+    Group write actions into waves that can each run as one batch.
+
+    Titles are resolved once per wave, before its batch runs. An action that
+    refers to a title an earlier action in the wave creates, renames or changes
+    ("add milk, then complete milk") starts a new wave, so it sees that change.
+    Adds never depend on anything and join the current wave.
+
+    Returns the indexes of the write actions in each wave, in their original order.
+    """
+    waves: List[List[int]] = []
+    current: List[int] = []
+    touched = set()
+    for index, action in enumerate(actions):
+        if action.get("ACTION") not in WRITE_ACTIONS:
+            continue
+        title = referenced_title(action)
+        if title is not None and title.lower() in touched:
+            waves.append(current)
+            current, touched = [], set()
+        current.append(index)
+        touched.update(touched_titles(action))
+    if current:
+        waves.append(current)
+    return waves
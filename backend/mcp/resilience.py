@@ -0,0 +1,272 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from app.core.settings import settings
+
+# Returned instead of a model reply while Gemini is unavailable. It does not
+# start with "ACTION:", so the response cache never stores it.
+UNAVAILABLE_REPLY = "The assistant is temporarily unavailable. Please try again in a moment."
+
+
+class ModelUnavailableError(Exception):
+    """Raised when a model call is refused or fails after all retries"""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"Model unavailable: {reason}")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After `failure_threshold` failures in a row the circuit opens and calls are
+    refused for `reset_seconds`. A single trial call is then let through; its
+    outcome closes the circuit again or reopens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> Optional[bool]:
+        """
+        Whether a call may go ahead now: None when refused, otherwise whether
+        the call is the half-open trial (and so must settle it).
+        """
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return False
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.rejected += 1
+            return None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or (self._opened_at is None and self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self.times_opened += 1
+            self._trial_running = False
+
+    def release_trial(self) -> None:
+        """Give up a trial call that ended without an outcome (cancelled or never started)"""
+        with self._lock:
+            self._trial_running = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state(),
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+class ModelGuard:
+    """
+    Bounds how model calls use the upstream: at most `max_concurrency` at once,
+    a queue timeout for the rest, a deadline per attempt, jittered retries and a
+    circuit breaker that refuses calls while the upstream keeps failing.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        queue_timeout: float,
+        call_timeout: float,
+        max_retries: int,
+        retry_base_delay: float,
+        breaker: CircuitBreaker,
+    ):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.call_timeout = call_timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.breaker = breaker
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counts = {"calls": 0, "retries": 0, "timeouts": 0, "failures": 0, "queue_timeouts": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    async def _acquire(self) -> bool:
+        """Take a slot; returns whether this call holds the breaker's trial"""
+        trial = self.breaker.allow()
+        if trial is None:
+            raise ModelUnavailableError("circuit open")
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._count("queue_timeouts")
+            # A queue timeout says nothing about upstream health
+            if trial:
+                self.breaker.release_trial()
+            raise ModelUnavailableError("too many concurrent requests")
+        with self._lock:
+            self._in_flight += 1
+            self._counts["calls"] += 1
+        return trial
+
+    def _release(self, trial: bool) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        # Only the trial's own call may clear the flag; any other call ending
+        # would let a second trial start while this one is still running
+        if trial:
+            self.breaker.release_trial()
+        self._slots.release()
+
+    def _failed(self, error: BaseException) -> None:
+        self._count("timeouts" if isinstance(error, asyncio.TimeoutError) else "failures")
+        self.breaker.record_failure()
+
+    async def _backoff(self, attempt: int) -> bool:
+        """Sleep before retry `attempt` (full jitter); False when no retry should be made"""
+        if attempt > self.max_retries or self.breaker.state == "open":
+            return False
+        self._count("retries")
+        await asyncio.sleep(random.uniform(0, self.retry_base_delay * 2 ** (attempt - 1)))
+        return True
+
+    async def call(self, make_call: Callable[[], Awaitable[str]]) -> str:
+        """Run `make_call` under the limits, retrying failed attempts"""
+        trial = await self._acquire()
+        try:
+            attempt = 0
+            while True:
+                try:
+                    result = await asyncio.wait_for(make_call(), self.call_timeout)
+                except Exception as e:
+                    self._failed(e)
+                    attempt += 1
+                    if not await self._backoff(attempt):
+                        raise ModelUnavailableError(str(e) or type(e).__name__) from e
+                    continue
+                self.breaker.record_success()
+                return result
+        finally:
+            self._release(trial)
+
+    async def stream(self, make_stream: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """
+        Iterate `make_stream` under the limits. Each chunk must arrive within the
+        call timeout; a stream is retried only if it fails before its first chunk.
+        """
+        trial = await self._acquire()
+        try:
+            attempt = 0
+            while True:
+                received = False
+                stream = make_stream()
+                try:
+                    while True:
+                        try:
+                            piece = await asyncio.wait_for(stream.__anext__(), self.call_timeout)
+                        except StopAsyncIteration:
+                            break
+                        received = True
+                        yield piece
+                except Exception as e:
+                    self._failed(e)
+                    attempt += 1
+                    if received or not await self._backoff(attempt):
+                        raise ModelUnavailableError(str(e) or type(e).__name__) from e
+                    continue
+                finally:
+                    await stream.aclose()
+                self.breaker.record_success()
+                return
+        finally:
+            self._release(trial)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                **self._counts,
+                "circuit": self.breaker.stats(),
+            }
+
+
+class GuardedModelClient:
+    """
+    Model client that runs another client's calls through a ModelGuard and
+    answers with UNAVAILABLE_REPLY instead of waiting on an unhealthy upstream.
+    """
+
+    def __init__(self, backend, guard: ModelGuard):
+        self.backend = backend
+        self.guard = guard
+
+    async def generate_response(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
+        try:
+            return await self.guard.call(lambda: self.backend.generate_response(prompt, context))
+        except ModelUnavailableError as e:
+            print(f"Model call not completed: {e.reason}")
+            return UNAVAILABLE_REPLY
+
+    async def stream_response(
+        self, prompt: str, context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        received = False
+        try:
+            async for piece in self.guard.stream(lambda: self.backend.stream_response(prompt, context)):
+                received = True
+                yield piece
+        except ModelUnavailableError as e:
+            print(f"Model call not completed: {e.reason}")
+            if received:
+                raise
+            yield UNAVAILABLE_REPLY
+
+
+def build_model_guard() -> ModelGuard:
+    breaker = CircuitBreaker(settings.chat_breaker_failure_threshold, settings.chat_breaker_reset_seconds)
+    return ModelGuard(
+        max_concurrency=settings.chat_max_concurrency,
+        queue_timeout=settings.chat_queue_timeout,
+        call_timeout=settings.chat_call_timeout,
+        max_retries=settings.chat_max_retries,
+        retry_base_delay=settings.chat_retry_base_delay,
+        breaker=breaker,
+    )
+
+
+model_guard = build_model_guard()
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import time
+from typing import Any, Dict, Optional
+
+from app.cache import CacheBackend, LRUCache
+from app.core.settings import settings
+
+
+def normalise_prompt(prompt: str) -> str:
+    """Case- and whitespace-insensitive form of a prompt, so trivial variations share an entry"""
+    return " ".join(prompt.lower().split())
+
+
+def context_fingerprint(context: Optional[Dict[str, Any]]) -> str:
+    """Digest of the task state sent to the model alongside the prompt"""
+    raw = json.dumps(context, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+class ChatResponseCache:
+    """
+    Caches model replies keyed by normalised prompt and task-state fingerprint.
+
+    Only the model's reply is cached; any action in it is executed again on a
+    hit. Any write that changes the task titles in the context changes the
+    fingerprint, so a reply is never reused against a different task state.
+    Free-text replies are not stored, since the client returns its errors that way.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.saved_seconds = 0.0
+
+    async def generate(self, client, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
+        cached = await self.lookup(prompt, context)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        reply = await client.generate_response(prompt, context)
+        await self.store(prompt, context, reply, time.perf_counter() - started)
+        return reply
+
+    async def lookup(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """The cached reply for this prompt and context, if any"""
+        cached = await self.backend.get(self._key(prompt, context))
+        if cached is None:
+            return None
+        entry = json.loads(cached)
+        self.saved_seconds += entry["seconds"]
+        return entry["reply"]
+
+    async def store(self, prompt: str, context: Optional[Dict[str, Any]], reply: str, seconds: float) -> None:
+        """Remember a reply that took `seconds` to generate, if it is a cacheable action"""
+        if reply.startswith("ACTION:"):
+            entry = json.dumps({"reply": reply, "seconds": seconds}).encode()
+            await self.backend.set(self._key(prompt, context), entry)
+
+    @staticmethod
+    def _key(prompt: str, context: Optional[Dict[str, Any]]) -> str:
+        return f"chat:{context_fingerprint(context)}:{normalise_prompt(prompt)}"
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.backend.stats(), "saved_ms": round(self.saved_seconds * 1000, 3)}
+
+
+chat_response_cache = ChatResponseCache(
+    LRUCache(settings.chat_cache_max_bytes, default_ttl=settings.chat_cache_ttl)
+)
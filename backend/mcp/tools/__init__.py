@@ -1,25 +1,37 @@
+from .context import ToolContext, tool_context
 from .add_task import add_task
-from .read_tasks import read_tasks, read_task_by_id
+from .read_tasks import read_tasks, read_task_by_id, read_recent_tasks, find_task_by_title
 from .update_task import update_task
 from .delete_task import delete_task
 from .complete_task import complete_task
+from .batch_tasks import find_tasks_by_titles, apply_task_batch
 
 # Define the tools available to the agent
 TOOLS = {
     "add_task": add_task,
     "read_tasks": read_tasks,
     "read_task_by_id": read_task_by_id,
+    "read_recent_tasks": read_recent_tasks,
+    "find_task_by_title": find_task_by_title,
     "update_task": update_task,
     "delete_task": delete_task,
-    "complete_task": complete_task
+    "complete_task": complete_task,
+    "find_tasks_by_titles": find_tasks_by_titles,
+    "apply_task_batch": apply_task_batch
 }
 
 __all__ = [
     "add_task",
     "read_tasks", 
     "read_task_by_id",
+    "read_recent_tasks",
+    "find_task_by_title",
     "update_task",
     "delete_task",
     "complete_task",
+    "find_tasks_by_titles",
+    "apply_task_batch",
+    "ToolContext",
+    "tool_context",
     "TOOLS"
 ]
\ No newline at end of file
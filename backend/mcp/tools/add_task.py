@@ -5,14 +5,11 @@ backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__
 sys.path.insert(0, backend_dir)
 
 from app.schemas.task import TaskCreate
-from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
-from app.db.database import engine  # Use the existing engine from the app
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
-from typing import Dict, Any
-
-async def add_task(title: str, description: str = "", priority: str = "medium") -> Dict[str, Any]:
+from mcp.tools.context import ToolContext, use_tool_context
+from typing import Dict, Any, Optional
+
+async def add_task(title: str, description: str = "", priority: str = "medium",
+                   ctx: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
     Add a new task to the todo app
 
@@ -20,16 +17,14 @@ async def add_task(title: str, description: str = "", priority: str = "medium")
         title: The title of the task
         description: The description of the task (optional)
         priority: The priority level of the task (low, medium, high) (optional)
+        ctx: The chat turn's tool context (optional; defaults to a transaction of its own)
 
     Returns:
         A dictionary containing the created task or an error message
     """
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
-            task_service = TaskService(task_repo)
-
+        # Run in the chat turn's transaction, or in one of its own
+        async with use_tool_context(ctx) as ctx:
             # Create the task
             task_create = TaskCreate(
                 title=title,
@@ -37,11 +32,11 @@ async def add_task(title: str, description: str = "", priority: str = "medium")
                 priority=priority
             )
 
-            created_task = await task_service.create_task(task_create)
+            created_task = await ctx.task_service.create_task(task_create)
 
             return {
                 "success": True,
-                "task": created_task.dict(),
+                "task": created_task.model_dump(),
                 "message": f"Task '{title}' added successfully"
             }
 
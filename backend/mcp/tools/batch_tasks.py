@@ -0,0 +1,65 @@
+import sys
+import os
+# Add the backend directory to the Python path to import backend functions
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, backend_dir)
+
+from app.schemas.task import TaskBatchOperation, TaskBatchRequest
+from mcp.tools.context import ToolContext, use_tool_context
+from typing import Dict, Any, List, Optional
+
+async def find_tasks_by_titles(titles: List[str], ctx: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Find the newest task for each of several titles, ignoring case, in one query
+
+    Args:
+        titles: The titles of the tasks to find
+        ctx: The chat turn's tool context (optional; defaults to a transaction of its own)
+
+    Returns:
+        A dictionary mapping each requested title that was found to its task, or an error message
+    """
+    try:
+        async with use_tool_context(ctx) as ctx:
+            tasks = await ctx.task_service.find_tasks_by_titles(titles)
+
+            return {
+                "success": True,
+                "tasks": {title: task.model_dump() for title, task in tasks.items()},
+                "message": f"Found {len(tasks)} matching tasks"
+            }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+async def apply_task_batch(operations: List[TaskBatchOperation],
+                           ctx: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Apply several task operations as set-based statements in one transaction
+
+    Args:
+        operations: Create, update, toggle and delete operations, as for POST /tasks:batch
+        ctx: The chat turn's tool context (optional; defaults to a transaction of its own)
+
+    Returns:
+        A dictionary with one result per operation, in order, or an error message
+    """
+    try:
+        async with use_tool_context(ctx) as ctx:
+            batch = await ctx.task_service.execute_batch(TaskBatchRequest(operations=operations))
+
+            return {
+                "success": True,
+                "results": [result.model_dump() for result in batch.results],
+                "message": f"Applied {len(operations)} task operations"
+            }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
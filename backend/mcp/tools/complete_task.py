@@ -4,54 +4,36 @@ import os
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, backend_dir)
 
-from app.schemas.task import TaskUpdate
-from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
-from app.db.database import engine
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any
+from mcp.tools.context import ToolContext, use_tool_context
+from typing import Dict, Any, Optional
 
-async def complete_task(task_id: str) -> Dict[str, Any]:
+async def complete_task(task_id: str, ctx: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
     Toggle the completion status of a task in the todo app
 
     Args:
         task_id: The ID of the task to toggle completion status
+        ctx: The chat turn's tool context (optional; defaults to a transaction of its own)
 
     Returns:
         A dictionary containing the updated task or an error message
     """
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
-            task_service = TaskService(task_repo)
-
-            # First, get the current task to check its completion status
-            current_task = await task_service.get_task_by_id(task_id)
-            if not current_task:
-                return {
-                    "success": False,
-                    "error": f"Task with ID {task_id} not found"
-                }
-
-            # Toggle the completion status
-            new_completed_status = not current_task.completed
-
-            # Update the task with the new completion status
-            task_update = TaskUpdate(completed=new_completed_status)
-            updated_task = await task_service.update_task(task_id, task_update)
+        # Run in the chat turn's transaction, or in one of its own
+        async with use_tool_context(ctx) as ctx:
+            # Flip the completion status in a single UPDATE ... RETURNING
+            updated_task = await ctx.task_service.toggle_task(task_id)
 
             if updated_task:
                 return {
                     "success": True,
-                    "task": updated_task.dict(),
+                    "task": updated_task.model_dump(),
                     "message": f"Task with ID {task_id} completion status toggled successfully"
                 }
             else:
                 return {
                     "success": False,
-                    "error": f"Failed to update task with ID {task_id}"
+                    "error": f"Task with ID {task_id} not found"
                 }
 
     except Exception as e:
@@ -0,0 +1,57 @@
+import sys
+import os
+# Add the backend directory to the Python path to import backend functions
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, backend_dir)
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.task_service import TaskService
+from app.repositories.cached_task_repository import CachedTaskRepository
+from app.db.database import AsyncSessionLocal
+
+
+class ToolContext:
+    """
+    The session, repository and service shared by every tool call in one chat turn.
+
+    Writes made through it are not committed until the turn ends, so a turn uses
+    one connection and one transaction however many tools it calls.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.task_repo = CachedTaskRepository(session, autocommit=False)
+        self.task_service = TaskService(self.task_repo)
+
+    async def commit(self) -> None:
+        await self.task_repo.commit()
+
+    async def rollback(self) -> None:
+        await self.task_repo.rollback()
+
+
+@asynccontextmanager
+async def tool_context() -> AsyncIterator[ToolContext]:
+    """Run a chat turn in one transaction: commit when the block exits, roll back if it raises"""
+    async with AsyncSessionLocal() as session:
+        ctx = ToolContext(session)
+        try:
+            yield ctx
+            await ctx.commit()
+        except BaseException:
+            await ctx.rollback()
+            raise
+
+
+@asynccontextmanager
+async def use_tool_context(ctx: Optional[ToolContext]) -> AsyncIterator[ToolContext]:
+    """The caller's context if one is given, otherwise a new one for this call alone"""
+    if ctx is not None:
+        yield ctx
+        return
+    async with tool_context() as ctx:
+        yield ctx
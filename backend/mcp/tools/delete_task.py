@@ -4,29 +4,24 @@ import os
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, backend_dir)
 
-from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
-from app.db.database import engine
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any
+from mcp.tools.context import ToolContext, use_tool_context
+from typing import Dict, Any, Optional
 
-async def delete_task(task_id: str) -> Dict[str, Any]:
+async def delete_task(task_id: str, ctx: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
     Delete a task from the todo app
 
     Args:
         task_id: The ID of the task to delete
+        ctx: The chat turn's tool context (optional; defaults to a transaction of its own)
 
     Returns:
         A dictionary containing success status or an error message
     """
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
-            task_service = TaskService(task_repo)
-
-            deleted = await task_service.delete_task(task_id)
+        # Run in the chat turn's transaction, or in one of its own
+        async with use_tool_context(ctx) as ctx:
+            deleted = await ctx.task_service.delete_task(task_id)
 
             if deleted:
                 return {
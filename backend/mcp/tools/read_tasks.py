@@ -4,31 +4,28 @@ import os
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, backend_dir)
 
-from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
-from app.db.database import engine
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
+from app.schemas.task import TaskQuery
+from mcp.tools.context import ToolContext, use_tool_context
 import asyncio
-from typing import Dict, Any, List
+from typing import Dict, Any, Optional, List
 
-async def read_tasks() -> Dict[str, Any]:
+async def read_tasks(ctx: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
     Read all tasks from the todo app
 
+    Args:
+        ctx: The chat turn's tool context (optional; defaults to a transaction of its own)
+
     Returns:
         A dictionary containing all tasks or an error message
     """
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
-            task_service = TaskService(task_repo)
-
-            tasks = await task_service.get_all_tasks()
+        # Run in the chat turn's transaction, or in one of its own
+        async with use_tool_context(ctx) as ctx:
+            tasks = await ctx.task_service.get_all_tasks()
 
             # Convert tasks to dictionaries
-            task_dicts = [task.dict() for task in tasks]
+            task_dicts = [task.model_dump() for task in tasks]
 
             return {
                 "success": True,
@@ -44,28 +41,26 @@ async def read_tasks() -> Dict[str, Any]:
         }
 
 
-async def read_task_by_id(task_id: str) -> Dict[str, Any]:
+async def read_task_by_id(task_id: str, ctx: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
     Read a specific task by its ID
 
     Args:
         task_id: The ID of the task to retrieve
+        ctx: The chat turn's tool context (optional; defaults to a transaction of its own)
 
     Returns:
         A dictionary containing the task or an error message
     """
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
-            task_service = TaskService(task_repo)
-
-            task = await task_service.get_task_by_id(task_id)
+        # Run in the chat turn's transaction, or in one of its own
+        async with use_tool_context(ctx) as ctx:
+            task = await ctx.task_service.get_task_by_id(task_id)
 
             if task:
                 return {
                     "success": True,
-                    "task": task.dict(),
+                    "task": task.model_dump(),
                     "message": f"Retrieved task with ID {task_id} successfully"
                 }
             else:
@@ -80,6 +75,72 @@ async def read_task_by_id(task_id: str) -> Dict[str, Any]:
             "error": str(e)
         }
 
+
+async def read_recent_tasks(limit: int = 50, ctx: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Read the most recently created tasks, without loading the whole list
+
+    Args:
+        limit: The maximum number of tasks to return
+        ctx: The chat turn's tool context (optional; defaults to a transaction of its own)
+
+    Returns:
+        A dictionary containing the tasks, whether more exist, or an error message
+    """
+    try:
+        async with use_tool_context(ctx) as ctx:
+            page = await ctx.task_service.get_tasks_page(TaskQuery(), limit)
+            task_dicts = [task.model_dump() for task in page.items]
+
+            return {
+                "success": True,
+                "tasks": task_dicts,
+                "count": len(task_dicts),
+                "has_more": page.next_cursor is not None,
+                "message": f"Retrieved {len(task_dicts)} recent tasks successfully"
+            }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+async def find_task_by_title(title: str, ctx: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Find a task by its title, ignoring case (uses the lower(title) index)
+
+    Args:
+        title: The title of the task to find
+        ctx: The chat turn's tool context (optional; defaults to a transaction of its own)
+
+    Returns:
+        A dictionary containing the newest task with that title or an error message
+    """
+    try:
+        async with use_tool_context(ctx) as ctx:
+            tasks = await ctx.task_service.find_tasks_by_title(title, limit=1)
+
+            if tasks:
+                return {
+                    "success": True,
+                    "task": tasks[0].model_dump(),
+                    "message": f"Found task titled '{title}'"
+                }
+            else:
+                return {
+                    "success": False,
+                    "not_found": True,
+                    "error": f"Task with title '{title}' not found"
+                }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
 if __name__ == "__main__":
     async def test_read_tasks():
         result = await read_tasks()
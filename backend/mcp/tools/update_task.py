@@ -5,14 +5,12 @@ backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__
 sys.path.insert(0, backend_dir)
 
 from app.schemas.task import TaskUpdate
-from app.services.task_service import TaskService
-from app.repositories.task_repository import TaskRepository
-from app.db.database import engine
-from sqlalchemy.ext.asyncio import AsyncSession
+from mcp.tools.context import ToolContext, use_tool_context
 from typing import Dict, Any, Optional
 
 async def update_task(task_id: str, title: Optional[str] = None, description: Optional[str] = None,
-                      priority: Optional[str] = None, completed: Optional[bool] = None) -> Dict[str, Any]:
+                      priority: Optional[str] = None, completed: Optional[bool] = None,
+                      ctx: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
     Update a task in the todo app
 
@@ -22,16 +20,14 @@ async def update_task(task_id: str, title: Optional[str] = None, description: Op
         description: The new description of the task (optional)
         priority: The new priority level of the task (optional)
         completed: The new completion status of the task (optional)
+        ctx: The chat turn's tool context (optional; defaults to a transaction of its own)
 
     Returns:
         A dictionary containing the updated task or an error message
     """
     try:
-        # Use the existing database session from the app
-        async with AsyncSession(bind=engine) as session:
-            task_repo = TaskRepository(session)
-            task_service = TaskService(task_repo)
-
+        # Run in the chat turn's transaction, or in one of its own
+        async with use_tool_context(ctx) as ctx:
             # Prepare the update object with only the fields that are provided
             update_data = {}
             if title is not None:
@@ -45,12 +41,12 @@ async def update_task(task_id: str, title: Optional[str] = None, description: Op
 
             task_update = TaskUpdate(**update_data)
 
-            updated_task = await task_service.update_task(task_id, task_update)
+            updated_task = await ctx.task_service.update_task(task_id, task_update)
 
             if updated_task:
                 return {
                     "success": True,
-                    "task": updated_task.dict(),
+                    "task": updated_task.model_dump(),
                     "message": f"Task with ID {task_id} updated successfully"
                 }
             else:
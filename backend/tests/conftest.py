@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite file before anything reads the settings
+TEST_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="todo-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{TEST_DB_PATH}"
+
+import pytest
+from sqlalchemy import event
+
+from app.cache import task_cache
+from app.db.database import Base, engine, AsyncSessionLocal
+from app.repositories.cached_task_repository import TASKS_GENERATION, LISTS_GENERATION
+import app.models.task  # noqa: F401  (registers the tables on Base)
+import app.models.task_tombstone  # noqa: F401
+import app.models.user  # noqa: F401
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def database():
+    """A freshly created, empty database for each test"""
+    await engine.dispose()
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # Entries cached by an earlier test describe rows that no longer exist
+    await task_cache.incr(TASKS_GENERATION)
+    await task_cache.incr(LISTS_GENERATION)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(database):
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def statements(database):
+    """SQL statements sent to the database while the test runs"""
+    sent = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield sent
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
@@ -0,0 +1,71 @@
+import httpx
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import insert, select
+
+from app.core.security import pwd_context
+from app.main import app
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "correct horse battery"
+# Cheaper argon2 parameters than the configured ones, as left behind by an older deployment
+outdated_context = CryptContext(schemes=["argon2"], argon2__rounds=1, argon2__memory_cost=1024, argon2__parallelism=1)
+
+
+async def add_user(session, password_hash):
+    user_id = (await session.execute(
+        insert(User).values(email="old@example.com", username="old", password_hash=password_hash).returning(User.id)
+    )).scalar_one()
+    await session.commit()
+    return user_id
+
+
+async def stored_hash(session, user_id):
+    session.expire_all()
+    return (await session.execute(select(User.password_hash).where(User.id == user_id))).scalar_one()
+
+
+async def sign_in(password):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post("/auth/signin", json={"email": "old@example.com", "password": password})
+
+
+async def test_signin_rewrites_an_outdated_hash(session):
+    old_hash = outdated_context.hash(PASSWORD)
+    assert pwd_context.needs_update(old_hash)
+    user_id = await add_user(session, old_hash)
+
+    assert (await sign_in(PASSWORD)).status_code == 200
+
+    new_hash = await stored_hash(session, user_id)
+    assert new_hash != old_hash
+    assert not pwd_context.needs_update(new_hash)
+    assert pwd_context.verify(PASSWORD, new_hash)
+    # The upgraded hash keeps working, and is left alone from then on
+    assert (await sign_in(PASSWORD)).status_code == 200
+    assert await stored_hash(session, user_id) == new_hash
+
+
+async def test_failed_signin_leaves_an_outdated_hash(session):
+    old_hash = outdated_context.hash(PASSWORD)
+    user_id = await add_user(session, old_hash)
+
+    assert (await sign_in("wrong password")).status_code == 401
+
+    assert await stored_hash(session, user_id) == old_hash
+
+
+async def test_rehash_does_not_overwrite_a_concurrent_password_change(session):
+    old_hash = outdated_context.hash(PASSWORD)
+    user_id = await add_user(session, old_hash)
+    changed = pwd_context.hash("a new password")
+    repo = UserRepository(session)
+
+    assert await repo.update_password_hash(user_id, old_hash, changed)
+
+    # A signin that read old_hash before the change finishes its rehash afterwards
+    assert not await repo.update_password_hash(user_id, old_hash, pwd_context.hash(PASSWORD))
+    assert await stored_hash(session, user_id) == changed
@@ -0,0 +1,122 @@
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.auth import ACCESS_TOKEN, REFRESH_TOKEN, TokenSigner, token_signer
+from app.auth.dependencies import revoke_token, verify_token
+from app.auth.tokens import _b64decode, _b64encode
+from app.main import app
+from app.utils.exceptions import InvalidTokenException
+
+pytestmark = pytest.mark.anyio
+
+USER_ID = uuid4()
+
+
+@pytest.fixture
+def signer():
+    return TokenSigner("test-secret", access_ttl=60, refresh_ttl=3600)
+
+
+@pytest.fixture
+async def client(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def with_claims(token: str, **changes) -> str:
+    """The token with some claims edited and its original signature kept"""
+    header, payload, signature = token.split(".")
+    claims = dict(json.loads(_b64decode(payload.encode())), **changes)
+    return ".".join([header, _b64encode(json.dumps(claims).encode()).decode(), signature])
+
+
+def rejected(signer, token, expected_type=ACCESS_TOKEN) -> str:
+    with pytest.raises(InvalidTokenException) as error:
+        signer.decode(token, expected_type)
+    return error.value.reason
+
+
+def test_issued_tokens_decode_to_their_claims(signer):
+    pair = signer.issue_pair(USER_ID, "a@example.com", "alice")
+
+    access = signer.decode(pair.access_token, ACCESS_TOKEN)
+    refresh = signer.decode(pair.refresh_token, REFRESH_TOKEN)
+
+    assert (access.sub, access.email, access.username) == (USER_ID, "a@example.com", "alice")
+    assert access.exp - access.iat == 60 and refresh.exp - refresh.iat == 3600
+    assert access.jti != refresh.jti
+    assert pair.expires_in == 60
+
+
+def test_tampered_tokens_are_rejected(signer):
+    token = signer.issue_pair(USER_ID, "a@example.com", "alice").access_token
+    header, payload, signature = token.split(".")
+
+    assert rejected(signer, with_claims(token, sub=str(uuid4()))) == "bad signature"
+    assert rejected(signer, with_claims(token, exp=2 ** 40)) == "bad signature"
+    assert rejected(signer, ".".join([header, payload, signature[::-1]])) == "bad signature"
+    assert rejected(TokenSigner("other-secret", 60, 3600), token) == "bad signature"
+    assert rejected(signer, "not a token") == "malformed"
+
+
+def test_expired_tokens_are_rejected():
+    signer = TokenSigner("test-secret", access_ttl=0, refresh_ttl=0)
+    pair = signer.issue_pair(USER_ID, "a@example.com", "alice")
+
+    assert rejected(signer, pair.access_token) == "expired"
+    assert rejected(signer, pair.refresh_token, REFRESH_TOKEN) == "expired"
+
+
+def test_tokens_are_only_accepted_as_their_own_type(signer):
+    pair = signer.issue_pair(USER_ID, "a@example.com", "alice")
+
+    assert rejected(signer, pair.refresh_token, ACCESS_TOKEN) == "not a access token"
+    assert rejected(signer, pair.access_token, REFRESH_TOKEN) == "not a refresh token"
+
+
+async def test_revoked_tokens_are_rejected():
+    pair = token_signer.issue_pair(USER_ID, "a@example.com", "alice")
+    claims = await verify_token(pair.access_token, ACCESS_TOKEN)
+
+    await revoke_token(claims)
+
+    with pytest.raises(InvalidTokenException, match="revoked"):
+        await verify_token(pair.access_token, ACCESS_TOKEN)
+    # Other tokens of the same user are unaffected
+    assert (await verify_token(pair.refresh_token, REFRESH_TOKEN)).sub == USER_ID
+
+
+async def test_refresh_rotates_the_pair(client):
+    signup = await client.post("/auth/signup", json={
+        "email": "rotate@example.com", "username": "rotate", "password": "correct horse battery",
+    })
+    first = signup.json()["tokens"]
+
+    response = await client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]})
+    assert response.status_code == 200
+    second = response.json()
+
+    me = await client.get("/auth/me", headers={"Authorization": f"Bearer {second['access_token']}"})
+    assert me.json()["email"] == "rotate@example.com"
+    # The used refresh token is spent; the new one still works once
+    replayed = await client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]})
+    assert (replayed.status_code, replayed.json()["detail"]) == (401, "Invalid token: revoked")
+    assert (await client.post("/auth/refresh", json={"refresh_token": second["refresh_token"]})).status_code == 200
+    # An access token can't stand in for a refresh token
+    misused = await client.post("/auth/refresh", json={"refresh_token": second["access_token"]})
+    assert misused.status_code == 401
+
+
+async def test_signout_revokes_both_tokens(client):
+    tokens = (await client.post("/auth/signup", json={
+        "email": "out@example.com", "username": "out", "password": "correct horse battery",
+    })).json()["tokens"]
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    await client.post("/auth/signout", headers=headers, json={"refresh_token": tokens["refresh_token"]})
+
+    assert (await client.get("/auth/me", headers=headers)).status_code == 401
+    assert (await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})).status_code == 401
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import select
+
+import mcp.agent
+from app.cache import LRUCache
+from app.models.task import Task
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate
+from mcp.agent import get_gemini_response
+from mcp.gemini_client import StubGeminiClient
+from mcp.response_cache import ChatResponseCache
+
+pytestmark = pytest.mark.anyio
+
+PROMPT = "Add task: milk, eggs and bread and complete laundry"
+
+
+@pytest.fixture(autouse=True)
+def response_cache(monkeypatch):
+    """A fresh reply cache per test, so no test is answered with another's reply"""
+    cache = ChatResponseCache(LRUCache(max_bytes=1024 * 1024))
+    monkeypatch.setattr(mcp.agent, "chat_response_cache", cache)
+    return cache
+
+
+async def tasks_by_title(session):
+    result = await session.execute(select(Task))
+    return {task.title: task for task in result.scalars()}
+
+
+async def test_multi_command_prompt_reaches_the_model(session):
+    await TaskRepository(session).create_task(TaskCreate(title="laundry"))
+    model = StubGeminiClient(
+        "ACTION:add_task|TITLE:milk\n"
+        "ACTION:add_task|TITLE:eggs\n"
+        "ACTION:add_task|TITLE:bread\n"
+        "ACTION:complete_task|TITLE:laundry"
+    )
+
+    reply = await get_gemini_response(PROMPT, client=model)
+
+    assert model.calls == 1
+    assert reply.splitlines() == [
+        "Here's what I did:",
+        '- Added "milk".',
+        '- Added "eggs".',
+        '- Added "bread".',
+        "- Completed 'laundry'.",
+    ]
+    tasks = await tasks_by_title(session)
+    assert set(tasks) == {"milk", "eggs", "bread", "laundry"}
+    assert tasks["laundry"].completed
+
+
+async def test_failed_action_is_reported_and_the_rest_commit(session):
+    await TaskRepository(session).create_task(TaskCreate(title="laundry"))
+    model = StubGeminiClient(
+        "ACTION:add_task|TITLE:milk\n"
+        "ACTION:delete_task|TITLE:cheese\n"
+        "ACTION:complete_task|TITLE:laundry"
+    )
+
+    reply = await get_gemini_response("Add milk, delete cheese and complete laundry", client=model)
+
+    assert reply.splitlines() == [
+        "Here's what I did:",
+        '- Added "milk".',
+        "- I couldn't find a task with the title 'cheese'.",
+        "- Completed 'laundry'.",
+    ]
+    session.expire_all()
+    tasks = await tasks_by_title(session)
+    assert set(tasks) == {"milk", "laundry"}
+    assert tasks["laundry"].completed
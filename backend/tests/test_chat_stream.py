@@ -0,0 +1,114 @@
+import json
+
+import anyio
+import httpx
+import pytest
+from sqlalchemy import select
+
+import mcp.agent
+from app.cache import LRUCache
+from app.main import app
+from app.models.task import Task
+from mcp.gemini_client import StubGeminiClient
+from mcp.response_cache import ChatResponseCache
+
+pytestmark = pytest.mark.anyio
+
+STREAM_PATH = "/api/v1/chat/stream"
+
+
+@pytest.fixture(autouse=True)
+def response_cache(monkeypatch):
+    """A fresh reply cache per test, so no test is answered with another's reply"""
+    monkeypatch.setattr(mcp.agent, "chat_response_cache", ChatResponseCache(LRUCache(max_bytes=1024 * 1024)))
+
+
+@pytest.fixture
+def use_model(monkeypatch):
+    """Answer chat messages with a StubGeminiClient instead of Gemini"""
+    def use(model: StubGeminiClient) -> StubGeminiClient:
+        monkeypatch.setattr(mcp.agent, "get_gemini_client", lambda: model)
+        return model
+    return use
+
+
+def parse_events(body: str):
+    """(event, data) pairs from an SSE body, checking each frame is well formed"""
+    assert body.endswith("\n\n")
+    events = []
+    for frame in body[:-2].split("\n\n"):
+        event_line, data_line = frame.split("\n")
+        assert event_line.startswith("event: ")
+        assert data_line.startswith("data: ")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+async def post_stream(message: str) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post(STREAM_PATH, json={"message": message})
+
+
+async def test_free_text_reply_streams_as_tokens(database, use_model):
+    model = use_model(StubGeminiClient("ACTION:general|RESPONSE:Plan the week, then rest.", chunk_size=5))
+
+    response = await post_stream("What should I do today?")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    events = parse_events(response.text)
+    assert events[-1] == ("done", {})
+    tokens = events[:-1]
+    assert len(tokens) > 1
+    assert all(event == "token" for event, _ in tokens)
+    assert "".join(data["text"] for _, data in tokens) == "Plan the week, then rest."
+    assert model.calls == 1
+
+
+async def test_action_runs_after_the_stream(database, session, use_model):
+    use_model(StubGeminiClient("ACTION:add_task|TITLE:Water the plants", chunk_size=4))
+
+    response = await post_stream("Remind me to water the plants")
+
+    assert parse_events(response.text) == [
+        ("message", {"text": 'Okay, I\'ve added "Water the plants" to your task list.'}),
+        ("done", {}),
+    ]
+    titles = (await session.execute(select(Task.title))).scalars().all()
+    assert titles == ["Water the plants"]
+
+
+async def test_client_disconnect_stops_the_stream(database, use_model):
+    reply = "ACTION:general|RESPONSE:" + "word " * 200
+    use_model(StubGeminiClient(reply, delay=2.0, chunk_size=5))
+    chunks = []
+    first_chunk = anyio.Event()
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": json.dumps({"message": "Tell me a story"}).encode()}
+        await first_chunk.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks.append(message["body"])
+            first_chunk.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.3"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": STREAM_PATH, "raw_path": STREAM_PATH.encode(),
+        "root_path": "", "query_string": b"", "server": ("test", 80), "client": ("127.0.0.1", 1234),
+        "headers": [(b"host", b"test"), (b"content-type", b"application/json")],
+    }
+    with anyio.fail_after(1):
+        await app(scope, receive, send)
+
+    body = b"".join(chunks).decode()
+    assert body.startswith("event: token\n")
+    assert "event: done" not in body
+    assert len(chunks) < len(reply) // 5
@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool import InstrumentedQueuePool, warm_pool
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def small_pool_engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=1, pool_timeout=0.5,
+    )
+    yield engine
+    await engine.dispose()
+
+
+async def test_warm_pool_opens_the_requested_connections(small_pool_engine):
+    await warm_pool(small_pool_engine, 2)
+
+    assert small_pool_engine.pool.checkedin() == 2
+
+
+async def test_warm_size_past_the_pool_is_capped(small_pool_engine):
+    # Asking for more than pool_size + max_overflow must not wait out pool_timeout
+    await warm_pool(small_pool_engine, 10)
+
+    pool = small_pool_engine.pool
+    assert pool.checkedin() == pool.size() == 2
+    assert pool.wait_stats.snapshot()["timeouts"] == 0
@@ -0,0 +1,41 @@
+import pytest
+
+from mcp.intents import parse_intent
+
+
+@pytest.mark.parametrize("prompt, expected", [
+    ("Add task: Buy milk", {"ACTION": "add_task", "TITLE": "Buy milk"}),
+    ('Please create a new task "Call mom".', {"ACTION": "add_task", "TITLE": "Call mom"}),
+    ("Add task: bread and butter", {"ACTION": "add_task", "TITLE": "bread and butter"}),
+    ("Add task: buy milk, eggs", {"ACTION": "add_task", "TITLE": "buy milk, eggs"}),
+    ("Add task: don't forget the keys", {"ACTION": "add_task", "TITLE": "don't forget the keys"}),
+    ("Delete task 'eggs'", {"ACTION": "delete_task", "TITLE": "eggs"}),
+    ("complete the task: Buy milk!", {"ACTION": "complete_task", "TITLE": "Buy milk"}),
+    ("Update task 'bread' to 'rye'", {"ACTION": "update_task", "OLD_TITLE": "bread", "NEW_TITLE": "rye"}),
+    ("Show me all my tasks", {"ACTION": "list_tasks"}),
+])
+def test_single_commands_are_parsed(prompt, expected):
+    assert parse_intent(prompt) == expected
+
+
+@pytest.mark.parametrize("prompt", [
+    "Update task 'bread' to 'rye' and task 'eggs' to 'duck eggs'",
+    "Complete task 'Buy milk' and delete task 'eggs'",
+    "Delete task 'eggs' then add task 'ham'",
+    "Add task: call the bank and also update the budget",
+    "Add task: milk, eggs and bread and complete laundry",
+    "Add task: milk. Delete task: eggs",
+    "Add task: milk, then complete laundry",
+])
+def test_compound_commands_go_to_the_model(prompt):
+    assert parse_intent(prompt) is None
+
+
+@pytest.mark.parametrize("prompt", [
+    "",
+    "Add task:",
+    "What should I do today?",
+    "Add task about the party",
+])
+def test_loose_phrasings_go_to_the_model(prompt):
+    assert parse_intent(prompt) is None
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from mcp.resilience import CircuitBreaker, ModelGuard, ModelUnavailableError
+
+pytestmark = pytest.mark.anyio
+
+
+def make_guard(breaker: CircuitBreaker) -> ModelGuard:
+    return ModelGuard(
+        max_concurrency=4, queue_timeout=1, call_timeout=5, max_retries=0, retry_base_delay=0, breaker=breaker
+    )
+
+
+async def test_only_the_trial_call_releases_the_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.04)
+    guard = make_guard(breaker)
+    release = asyncio.Event()
+
+    async def slow():
+        await release.wait()
+        return "ok"
+
+    # Admitted while closed, still running when the circuit opens and goes half-open
+    old_call = asyncio.create_task(guard.call(slow))
+    await asyncio.sleep(0.01)
+    breaker.record_failure()
+    await asyncio.sleep(0.05)
+    trial_call = asyncio.create_task(guard.call(slow))
+    await asyncio.sleep(0.01)
+    assert breaker.state == "half_open"
+
+    old_call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await old_call
+
+    # The trial is still running, so no second trial may start
+    assert breaker.allow() is None
+    with pytest.raises(ModelUnavailableError):
+        await guard.call(slow)
+
+    release.set()
+    assert await trial_call == "ok"
+    assert breaker.state == "closed"
+
+
+async def test_cancelled_trial_lets_the_next_call_try():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.04)
+    guard = make_guard(breaker)
+    breaker.record_failure()
+    await asyncio.sleep(0.05)
+
+    trial_call = asyncio.create_task(guard.call(asyncio.Event().wait))
+    await asyncio.sleep(0.01)
+    trial_call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial_call
+
+    async def ok():
+        return "ok"
+
+    assert await guard.call(ok) == "ok"
+    assert breaker.state == "closed"
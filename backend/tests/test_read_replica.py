@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.db.database as db
+from app.core.settings import settings
+from app.db.database import Base, engine
+from app.main import app
+from app.models.task import Task
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def replica(monkeypatch, tmp_path, database):
+    """A second SQLite file standing in for a read replica, synced only by calling it"""
+    replica_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(db, "read_engine", replica_engine)
+    monkeypatch.setattr(db, "AsyncReadSessionLocal", sessionmaker(
+        bind=replica_engine, class_=AsyncSession, expire_on_commit=False
+    ))
+
+    async def catch_up():
+        async with engine.connect() as source:
+            rows = (await source.execute(select(Task.__table__))).mappings().all()
+        async with replica_engine.begin() as target:
+            await target.execute(delete(Task.__table__))
+            if rows:
+                await target.execute(insert(Task.__table__), [dict(row) for row in rows])
+
+    yield catch_up
+    await replica_engine.dispose()
+
+
+def make_client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_lagging_replica_reads_do_not_fill_the_cache(replica):
+    async with make_client() as writer, make_client() as reader:
+        task_id = (await writer.post("/api/v1/tasks", json={"title": "old"})).json()["id"]
+        await replica()
+        assert (await writer.put(f"/api/v1/tasks/{task_id}", json={"title": "new"})).status_code == 200
+
+        # The replica still lags, so an unpinned reader sees the old title
+        assert (await reader.get(f"/api/v1/tasks/{task_id}")).json()["title"] == "old"
+        assert [task["title"] for task in (await reader.get("/api/v1/tasks")).json()] == ["old"]
+
+        # Once the replica has caught up, nobody is served "old" from the cache
+        await replica()
+        assert (await writer.get(f"/api/v1/tasks/{task_id}")).json()["title"] == "new"
+        assert [task["title"] for task in (await reader.get("/api/v1/tasks")).json()] == ["new"]
+
+
+
+async def test_sync_sees_writes_the_replica_has_not_caught_up_with(replica, monkeypatch):
+    monkeypatch.setattr(settings, "sync_commit_skew_seconds", 0)
+    async with make_client() as client:
+        task_id = (await client.post("/api/v1/tasks", json={"title": "old"})).json()["id"]
+        await replica()
+        # SQLite stamps rows to the second; keep each step in a second of its own
+        await asyncio.sleep(1.1)
+        snapshot = (await client.get("/api/v1/tasks/changes")).json()
+        await asyncio.sleep(1.1)
+
+        await client.put(f"/api/v1/tasks/{task_id}", json={"title": "new"})
+        changes = (await client.get("/api/v1/tasks/changes", params={"since": snapshot["next_cursor"]})).json()
+        assert [task["title"] for task in changes["updated"]] == ["new"]
+
+        # Nor is it skipped once the replica catches up
+        await replica()
+        later = (await client.get("/api/v1/tasks/changes", params={"since": snapshot["next_cursor"]})).json()
+        assert [task["title"] for task in later["updated"]] == ["new"]
@@ -0,0 +1,66 @@
+import httpx
+import pytest
+
+from app.main import app
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def create_task(client, title):
+    response = await client.post("/api/v1/tasks", json={"title": title})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def test_batch_reports_each_operation_in_request_order(client):
+    keep, toggle, remove = [await create_task(client, title) for title in ("keep", "toggle", "remove")]
+
+    response = await client.post("/api/v1/tasks:batch", json={"operations": [
+        {"op": "delete", "id": remove},
+        {"op": "toggle", "id": toggle},
+        {"op": "update", "id": keep, "task": {"title": "kept"}},
+        {"op": "create", "task": {"title": "new"}},
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(result["index"], result["op"], result["success"]) for result in results] == [
+        (0, "delete", True), (1, "toggle", True), (2, "update", True), (3, "create", True),
+    ]
+    assert results[1]["task"]["completed"] is True
+    assert results[2]["task"]["title"] == "kept"
+    titles = {task["title"]: task for task in (await client.get("/api/v1/tasks")).json()}
+    assert set(titles) == {"kept", "toggle", "new"}
+
+
+async def test_batch_touching_a_task_twice_is_rejected(client):
+    task_id = await create_task(client, "once")
+
+    response = await client.post("/api/v1/tasks:batch", json={"operations": [
+        {"op": "toggle", "id": task_id},
+        {"op": "update", "id": task_id, "task": {"completed": True}},
+    ]})
+
+    assert response.status_code == 422
+    task = (await client.get(f"/api/v1/tasks/{task_id}")).json()
+    assert task["completed"] is False
+
+
+async def test_batch_reports_missing_tasks(client):
+    missing = "00000000-0000-0000-0000-000000000000"
+    response = await client.post("/api/v1/tasks:batch", json={"operations": [
+        {"op": "toggle", "id": missing},
+        {"op": "create", "task": {"title": "made"}},
+    ]})
+
+    results = response.json()["results"]
+    assert results[0] == {
+        "index": 0, "op": "toggle", "success": False, "task": None, "error": f"Task with id {missing} not found",
+    }
+    assert results[1]["success"] is True
@@ -0,0 +1,156 @@
+import pytest
+
+from app.cache import LRUCache
+from app.db.database import AsyncSessionLocal
+from app.repositories.cached_task_repository import CachedTaskRepository, TASKS_GENERATION, LISTS_GENERATION
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate, TaskUpdate, TaskQuery, TaskBulkUpdate
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def cache():
+    return LRUCache(max_bytes=1024 * 1024)
+
+
+@pytest.fixture
+def repo(session, cache):
+    return CachedTaskRepository(session, cache=cache)
+
+
+async def test_get_task_miss_then_hit(repo, cache, statements):
+    task = await repo.create_task(TaskCreate(title="Buy milk"))
+    statements.clear()
+
+    first = await repo.get_task_by_id(task.id)
+    assert len(statements) == 1 and cache.misses >= 1
+
+    hits = cache.hits
+    second = await repo.get_task_by_id(task.id)
+    assert len(statements) == 1  # served from the cache
+    assert cache.hits == hits + 2  # the version token, then the task
+    assert first.title == second.title == "Buy milk"
+
+
+async def test_list_miss_then_hit(repo, statements):
+    await repo.create_task(TaskCreate(title="Buy milk"))
+    statements.clear()
+
+    assert [t.title for t in await repo.get_all_tasks()] == ["Buy milk"]
+    assert [t.title for t in await repo.get_all_tasks()] == ["Buy milk"]
+    assert len(statements) == 1
+
+
+async def test_missing_task_is_not_cached(repo, statements):
+    from uuid import uuid4
+    task_id = uuid4()
+    assert await repo.get_task_by_id(task_id) is None
+    assert await repo.get_task_by_id(task_id) is None
+    assert len(statements) == 2
+
+
+async def test_create_invalidates_lists(repo):
+    await repo.create_task(TaskCreate(title="a"))
+    assert len(await repo.get_all_tasks()) == 1
+    await repo.create_task(TaskCreate(title="b"))
+    assert len(await repo.get_all_tasks()) == 2
+
+
+async def test_update_invalidates_task_and_lists(repo):
+    task = await repo.create_task(TaskCreate(title="old"))
+    await repo.get_task_by_id(task.id)
+    await repo.get_all_tasks()
+
+    await repo.update_task(task.id, TaskUpdate(title="new"))
+
+    assert (await repo.get_task_by_id(task.id)).title == "new"
+    assert [t.title for t in await repo.get_all_tasks()] == ["new"]
+
+
+async def test_toggle_invalidates_task_and_lists(repo):
+    task = await repo.create_task(TaskCreate(title="a"))
+    await repo.get_task_by_id(task.id)
+    await repo.get_all_tasks(TaskQuery(completed=True))
+
+    await repo.toggle_task(task.id)
+
+    assert (await repo.get_task_by_id(task.id)).completed is True
+    assert len(await repo.get_all_tasks(TaskQuery(completed=True))) == 1
+
+
+async def test_delete_invalidates_task_and_lists(repo):
+    task = await repo.create_task(TaskCreate(title="a"))
+    await repo.get_task_by_id(task.id)
+    await repo.get_all_tasks()
+
+    await repo.delete_task(task.id)
+
+    assert await repo.get_task_by_id(task.id) is None
+    assert await repo.get_all_tasks() == []
+
+
+async def test_bulk_update_invalidates_every_task(repo, cache):
+    task = await repo.create_task(TaskCreate(title="a"))
+    await repo.get_task_by_id(task.id)
+
+    await repo.update_tasks_where(TaskQuery(), TaskBulkUpdate(completed=True))
+
+    # A later request has its own session, so nothing comes from this one's identity map
+    async with AsyncSessionLocal() as other_session:
+        fresh = await CachedTaskRepository(other_session, cache=cache).get_task_by_id(task.id)
+    assert fresh.completed is True
+
+
+async def test_stale_row_stored_after_a_write_is_never_read(session, repo, cache):
+    task = await repo.create_task(TaskCreate(title="old"))
+
+    # A reader picks its key and loads the row, then stalls before storing it
+    stale_key = await repo._task_key(task.id)
+    stale_value = repo._dump_task(await TaskRepository(session).get_task_by_id(task.id))
+
+    await repo.update_task(task.id, TaskUpdate(title="new"))
+    await cache.set(stale_key, stale_value)
+
+    assert (await repo.get_task_by_id(task.id)).title == "new"
+
+
+async def test_deferred_commit_invalidates_again_after_commit(session, cache):
+    repo = CachedTaskRepository(session, cache=cache, autocommit=False)
+    task = await repo.create_task(TaskCreate(title="old"))
+    await repo.commit()
+
+    await repo.update_task(task.id, TaskUpdate(title="new"))
+    # A concurrent reader caches the row before the transaction commits
+    reader = CachedTaskRepository(session, cache=cache)
+    key = await reader._task_key(task.id)
+    stale = await TaskRepository(session).get_task_by_id(task.id)
+    await cache.set(key, reader._dump_task(stale).replace(b'"new"', b'"old"'))
+    await repo.commit()
+
+    assert (await reader.get_task_by_id(task.id)).title == "new"
+
+
+async def test_task_versions_stay_within_the_byte_budget(session):
+    cache = LRUCache(max_bytes=4096)
+    repo = CachedTaskRepository(session, cache=cache)
+    for i in range(50):
+        task = await repo.create_task(TaskCreate(title=f"Task {i}"))
+        await repo.get_task_by_id(task.id)
+        await repo.update_task(task.id, TaskUpdate(title=f"Task {i}!"))
+        await repo.get_task_by_id(task.id)
+
+    # Only the generation counters live outside the budget
+    assert set(cache._counters) <= {TASKS_GENERATION, LISTS_GENERATION}
+    assert cache.current_bytes <= cache.max_bytes
+    assert cache.evictions > 0
+
+
+async def test_lost_version_token_is_a_miss(session, repo, cache):
+    task = await repo.create_task(TaskCreate(title="old"))
+    await repo.get_task_by_id(task.id)
+    await TaskRepository(session).update_task(task.id, TaskUpdate(title="new"))
+
+    # Evicted or expired: the next read must not find the entry cached under it
+    await cache.delete(repo._task_version_key(task.id))
+    assert (await repo.get_task_by_id(task.id)).title == "new"
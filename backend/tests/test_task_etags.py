@@ -0,0 +1,77 @@
+import httpx
+import pytest
+
+from app.cache import task_cache
+from app.main import app
+from app.repositories.cached_task_repository import LISTS_GENERATION
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def create_tasks(client, count):
+    for i in range(count):
+        response = await client.post("/api/v1/tasks", json={"title": f"Task {i}"})
+        assert response.status_code == 201
+
+
+async def test_page_etag_needs_no_extra_query(client, statements):
+    await create_tasks(client, 5)
+    statements.clear()
+
+    first = await client.get("/api/v1/tasks", params={"limit": 2})
+    assert len(statements) == 1  # just the page query
+    again = await client.get("/api/v1/tasks", params={"limit": 2}, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200 and len(first.json()["items"]) == 2
+    assert again.status_code == 304
+    assert not any("count(" in statement.lower() or "max(" in statement.lower() for statement in statements)
+
+
+async def test_page_etag_changes_when_a_task_on_it_changes(client):
+    await create_tasks(client, 3)
+    first = await client.get("/api/v1/tasks", params={"limit": 2})
+    task_id = first.json()["items"][0]["id"]
+
+    await client.put(f"/api/v1/tasks/{task_id}", json={"title": "Renamed"})
+    again = await client.get("/api/v1/tasks", params={"limit": 2}, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert again.status_code == 200
+    assert again.json()["items"][0]["title"] == "Renamed"
+    assert again.headers["ETag"] != first.headers["ETag"]
+
+
+async def test_full_list_etag_round_trip(client):
+    await create_tasks(client, 3)
+    first = await client.get("/api/v1/tasks")
+    assert first.status_code == 200 and len(first.json()) == 3
+
+    unchanged = await client.get("/api/v1/tasks", headers={"If-None-Match": first.headers["ETag"]})
+    assert unchanged.status_code == 304
+
+    await create_tasks(client, 1)
+    changed = await client.get("/api/v1/tasks", headers={"If-None-Match": first.headers["ETag"]})
+    assert changed.status_code == 200 and len(changed.json()) == 4
+
+
+async def test_cached_list_keeps_the_etag_it_was_read_at(client, session):
+    await create_tasks(client, 1)
+    assert (await client.get("/api/v1/tasks")).status_code == 200
+
+    # Another worker writes; this worker's cached list doesn't hear about it
+    await TaskRepository(session).create_task(TaskCreate(title="Elsewhere"))
+    stale = await client.get("/api/v1/tasks")
+    assert [task["title"] for task in stale.json()] == ["Task 0"]
+
+    # Once the entry expires, the ETag the stale body was served with no longer matches
+    await task_cache.incr(LISTS_GENERATION)
+    fresh = await client.get("/api/v1/tasks", headers={"If-None-Match": stale.headers["ETag"]})
+    assert fresh.status_code == 200
+    assert {task["title"] for task in fresh.json()} == {"Task 0", "Elsewhere"}
@@ -0,0 +1,96 @@
+import httpx
+import pytest
+from sqlalchemy import select
+
+import app.services.task_service as task_service_module
+from app.main import app
+from app.models.task import Task
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import ExportFormat
+from app.services.task_service import TaskService
+
+pytestmark = pytest.mark.anyio
+
+
+async def pieces(data: bytes, size: int = 7):
+    """Feed the import in small pieces so records straddle piece boundaries"""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def run_import(session, data: bytes, import_format: ExportFormat, repository=TaskRepository):
+    return await TaskService(repository(session)).import_tasks(pieces(data), import_format)
+
+
+async def titles(session):
+    return (await session.execute(select(Task.title).order_by(Task.title))).scalars().all()
+
+
+async def test_ndjson_import_reports_invalid_rows_by_line(session):
+    data = (
+        b'{"title": "one"}\n'
+        b'\n'
+        b'{"title": ""}\n'
+        b'not json\n'
+        b'{"title": "two", "priority": "high", "extra": 1}\n'
+        b'{"description": "no title"}'
+    )
+
+    result = await run_import(session, data, ExportFormat.ndjson)
+
+    assert (result.imported, result.failed) == (2, 3)
+    assert [error.line for error in result.errors] == [3, 4, 6]
+    assert result.errors[2].error == "title: Field required"
+    assert await titles(session) == ["one", "two"]
+
+
+async def test_csv_records_may_span_lines(session):
+    data = (
+        b'title,description,priority\r\n'
+        b'plain,,low\r\n'
+        b'"multi, line","first\r\nsecond\r\nthird",high\r\n'
+        b',missing title,\r\n'
+        b'"with ""quotes""",,\r\n'
+    )
+
+    result = await run_import(session, data, ExportFormat.csv)
+
+    assert (result.imported, result.failed) == (3, 1)
+    # The bad row starts on line 6, after the three lines of the quoted record
+    assert [(error.line, error.error) for error in result.errors] == [(6, "title: Field required")]
+    rows = {task.title: task for task in (await session.execute(select(Task))).scalars()}
+    assert set(rows) == {"plain", "multi, line", 'with "quotes"'}
+    assert rows["multi, line"].description == "first\r\nsecond\r\nthird"
+    assert rows['with "quotes"'].priority == "medium"
+
+
+async def test_rejected_chunk_is_reported_and_the_import_continues(session, monkeypatch):
+    monkeypatch.setattr(task_service_module, "IMPORT_CHUNK_SIZE", 2)
+
+    class FailingSecondChunk(TaskRepository):
+        chunks = 0
+
+        async def insert_task_rows(self, rows):
+            FailingSecondChunk.chunks += 1
+            if FailingSecondChunk.chunks == 2:
+                raise RuntimeError("disk full")
+            return await super().insert_task_rows(rows)
+
+    data = b"".join(b'{"title": "task %d"}\n' % i for i in range(1, 6))
+    result = await run_import(session, data, ExportFormat.ndjson, FailingSecondChunk)
+
+    assert (result.imported, result.failed) == (3, 2)
+    assert [(error.line, error.error) for error in result.errors] == [
+        (3, "2 rows starting here were not written: disk full"),
+    ]
+    assert await titles(session) == ["task 1", "task 2", "task 5"]
+
+
+async def test_import_route_accepts_csv(database):
+    body = b"title,completed\nfirst,true\nsecond,\n"
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/v1/tasks/import", params={"format": "csv"}, content=body)
+        listed = (await client.get("/api/v1/tasks", params={"sort_by": "title", "order": "asc"})).json()
+
+    assert response.json() == {"imported": 2, "failed": 0, "errors": []}
+    assert [(task["title"], task["completed"]) for task in listed] == [("first", True), ("second", False)]
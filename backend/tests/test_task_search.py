@@ -0,0 +1,48 @@
+import httpx
+import pytest
+
+from app.main import app
+from app.repositories.task_repository import TaskRepository
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def search(client, q):
+    response = await client.get("/api/v1/tasks/search", params={"q": q})
+    assert response.status_code == 200
+    return [task["title"] for task in response.json()["items"]]
+
+
+async def test_search_follows_updates_and_deletes(client):
+    task_id = (await client.post("/api/v1/tasks", json={
+        "title": "Quarterly report", "description": "numbers for the board",
+    })).json()["id"]
+    await client.post("/api/v1/tasks", json={"title": "Board meeting"})
+    assert await search(client, "quarterly") == ["Quarterly report"]
+
+    await client.put(f"/api/v1/tasks/{task_id}", json={"title": "Annual report", "description": "for auditors"})
+
+    assert await search(client, "quarterly") == []
+    assert await search(client, "annual") == ["Annual report"]
+    assert await search(client, "board") == ["Board meeting"]
+
+    await client.delete(f"/api/v1/tasks/{task_id}")
+
+    assert await search(client, "annual") == []
+    assert await search(client, "report") == []
+
+
+async def test_bulk_inserted_rows_are_searchable(session):
+    repo = TaskRepository(session)
+    await repo.insert_task_rows([
+        {"title": f"imported {i}", "description": "zeppelin" if i == 2 else "", "completed": False, "priority": "low"}
+        for i in range(5)
+    ])
+
+    assert [task.title for task in await repo.search_tasks("zeppelin", limit=10)] == ["imported 2"]
@@ -0,0 +1,55 @@
+import pytest
+
+import mcp.agent
+from app.cache import LRUCache
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate
+from mcp.agent import get_gemini_response
+from mcp.gemini_client import StubGeminiClient
+from mcp.response_cache import ChatResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def response_cache(monkeypatch):
+    monkeypatch.setattr(mcp.agent, "chat_response_cache", ChatResponseCache(LRUCache(max_bytes=1024 * 1024)))
+
+
+async def test_find_by_title_ignores_ascii_case_and_keeps_accents(session):
+    repo = TaskRepository(session)
+    task = await repo.create_task(TaskCreate(title="Éclair recipe"))
+
+    assert [found.id for found in await repo.find_tasks_by_title("Éclair recipe")] == [task.id]
+    assert [found.id for found in await repo.find_tasks_by_title("Éclair RECIPE")] == [task.id]
+
+
+async def test_find_by_titles_is_keyed_by_the_requested_title(session):
+    repo = TaskRepository(session)
+    eclair = await repo.create_task(TaskCreate(title="Éclair recipe"))
+    milk = await repo.create_task(TaskCreate(title="Buy milk"))
+
+    found = await repo.find_tasks_by_titles(["Éclair recipe", "BUY MILK", "Missing"])
+
+    assert {title: task.id for title, task in found.items()} == {"Éclair recipe": eclair.id, "BUY MILK": milk.id}
+
+
+async def test_local_command_finds_non_ascii_title(session):
+    await TaskRepository(session).create_task(TaskCreate(title="Éclair recipe"))
+
+    reply = await get_gemini_response("Complete task 'Éclair recipe'")
+
+    assert "couldn't find" not in reply
+    session.expire_all()
+    assert (await TaskRepository(session).find_tasks_by_title("Éclair recipe"))[0].completed
+
+
+async def test_multi_action_reply_finds_non_ascii_titles(session):
+    repo = TaskRepository(session)
+    await repo.create_task(TaskCreate(title="Éclair recipe"))
+    await repo.create_task(TaskCreate(title="Crème brûlée"))
+    model = StubGeminiClient("ACTION:complete_task|TITLE:Éclair recipe\nACTION:delete_task|TITLE:Crème brûlée")
+
+    reply = await get_gemini_response("Finish the éclair and drop the crème brûlée", client=model)
+
+    assert reply.splitlines() == ["Here's what I did:", "- Completed 'Éclair recipe'.", "- Deleted 'Crème brûlée'."]
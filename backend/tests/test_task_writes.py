@@ -0,0 +1,120 @@
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.main import app
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate, TaskUpdate
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_create_is_one_statement(session, statements):
+    task = await TaskRepository(session).create_task(TaskCreate(title="Buy milk"))
+
+    assert task.title == "Buy milk"
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("INSERT")
+
+
+async def test_update_is_one_statement(session, statements):
+    repo = TaskRepository(session)
+    task = await repo.create_task(TaskCreate(title="Buy milk"))
+    statements.clear()
+
+    updated = await repo.update_task(task.id, TaskUpdate(title="Buy oat milk"))
+
+    assert updated.title == "Buy oat milk"
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("UPDATE")
+
+
+async def test_toggle_is_one_statement(session, statements):
+    repo = TaskRepository(session)
+    task = await repo.create_task(TaskCreate(title="Buy milk"))
+    statements.clear()
+
+    toggled = await repo.toggle_task(task.id)
+
+    assert toggled.completed is True
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("UPDATE")
+
+
+async def test_delete_is_one_statement(session, statements):
+    repo = TaskRepository(session)
+    task = await repo.create_task(TaskCreate(title="Buy milk"))
+    statements.clear()
+
+    assert await repo.delete_task(task.id) is True
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("DELETE")
+
+
+async def test_missing_task_writes_are_one_statement(session, statements):
+    repo = TaskRepository(session)
+
+    assert await repo.update_task(uuid4(), TaskUpdate(title="x")) is None
+    assert await repo.toggle_task(uuid4()) is None
+    assert await repo.delete_task(uuid4()) is False
+    assert len(statements) == 3
+
+
+# The same writes through the routes, which use CachedTaskRepository via
+# get_task_service, so extra queries added by the router or service show up too
+
+@pytest.fixture
+async def client(database):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def statement_kinds(statements):
+    return [statement.lstrip().split(None, 1)[0].upper() for statement in statements]
+
+
+async def test_create_route_is_one_statement(client, statements):
+    response = await client.post("/api/v1/tasks", json={"title": "Buy milk"})
+
+    assert response.status_code == 201
+    assert statement_kinds(statements) == ["INSERT"]
+
+
+async def test_update_route_is_one_statement(client, statements):
+    task_id = (await client.post("/api/v1/tasks", json={"title": "Buy milk"})).json()["id"]
+    statements.clear()
+
+    response = await client.put(f"/api/v1/tasks/{task_id}", json={"title": "Buy oat milk"})
+
+    assert response.json()["title"] == "Buy oat milk"
+    assert statement_kinds(statements) == ["UPDATE"]
+
+
+async def test_complete_route_is_one_statement(client, statements):
+    task_id = (await client.post("/api/v1/tasks", json={"title": "Buy milk"})).json()["id"]
+    statements.clear()
+
+    response = await client.patch(f"/api/v1/tasks/{task_id}/complete")
+
+    assert response.json()["completed"] is True
+    assert statement_kinds(statements) == ["UPDATE"]
+
+
+async def test_delete_route_is_one_statement(client, statements):
+    task_id = (await client.post("/api/v1/tasks", json={"title": "Buy milk"})).json()["id"]
+    statements.clear()
+
+    response = await client.delete(f"/api/v1/tasks/{task_id}")
+
+    assert response.status_code == 204
+    assert statement_kinds(statements) == ["DELETE"]
+
+
+async def test_missing_task_routes_are_one_statement_each(client, statements):
+    missing = uuid4()
+
+    assert (await client.put(f"/api/v1/tasks/{missing}", json={"title": "x"})).status_code == 404
+    assert (await client.patch(f"/api/v1/tasks/{missing}/complete")).status_code == 404
+    assert (await client.delete(f"/api/v1/tasks/{missing}")).status_code == 404
+    assert statement_kinds(statements) == ["UPDATE", "UPDATE", "DELETE"]